@@ -1,12 +1,37 @@
 """CookieMonster package."""
 
-from .browser_profiles import resolve_profile
-from .capture import audience_domain, extract_token_details, extract_tokens
-from .chrome_launcher import browser_is_reachable, is_browser_process_running
-from .client import CookieMonsterClient
-from .config import CaptureConfig, ReplayConfig
-from .models import CapturedRequest
-from .tab_manager import TabHandle, TabManager, TabManagerConfig
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .browser_profiles import resolve_profile
+    from .capture import audience_domain, extract_token_details, extract_tokens
+    from .chrome_launcher import browser_is_reachable, is_browser_process_running
+    from .client import CookieMonsterClient
+    from .config import CaptureConfig, ReplayConfig
+    from .models import CapturedRequest
+    from .tab_manager import TabHandle, TabManager, TabManagerConfig
+
+# Public name -> submodule. Resolved on first access so that importing a
+# submodule such as ``cookie_monster.cli`` doesn't load the CDP/websocket
+# stack behind ``capture`` and ``tab_manager``.
+_EXPORTS = {
+    "CapturedRequest": "models",
+    "CaptureConfig": "config",
+    "CookieMonsterClient": "client",
+    "ReplayConfig": "config",
+    "TabHandle": "tab_manager",
+    "TabManager": "tab_manager",
+    "TabManagerConfig": "tab_manager",
+    "audience_domain": "capture",
+    "browser_is_reachable": "chrome_launcher",
+    "extract_token_details": "capture",
+    "extract_tokens": "capture",
+    "is_browser_process_running": "chrome_launcher",
+    "resolve_profile": "browser_profiles",
+}
 
 __all__ = [
     "CapturedRequest",
@@ -23,3 +48,16 @@ __all__ = [
     "is_browser_process_running",
     "resolve_profile",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,52 +1,174 @@
 from __future__ import annotations
 
-import json
+import hmac
+import multiprocessing
 import os
-from dataclasses import asdict
+import socket
+import threading
+from collections import defaultdict
+from dataclasses import replace
+from functools import lru_cache, wraps
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from ipaddress import ip_address
 from pathlib import Path
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
 from .browser_profiles import default_user_data_dir
-from .browser_session import BrowserLaunchConfig, BrowserSession
-from .capture import capture_requests
 from .chrome_discovery import list_page_targets
 from .config import CaptureConfig, ReplayConfig
 from .crypto import load_or_create_key, resolve_key
-from .diffing import compare_capture_files
-from .plugins import auto_detect_adapter
-from .replay import replay_with_capture
-from .security_utils import redact_headers, url_host
-from .session_health import analyze_session_health
+from .json_utils import dumps as json_dumps
+from .json_utils import loads as json_loads
+from .models import CapturedRequest
+from .security_utils import redact_headers
 from .storage import load_captures
 from .ui import logo_svg, page_html
 
+if TYPE_CHECKING:
+    from multiprocessing.synchronize import BoundedSemaphore as ProcessSemaphore
+
 MAX_JSON_BODY_BYTES = 1_048_576
+MAX_CONCURRENT_JOBS = 4
+JOB_SLOT_TIMEOUT_SECONDS = 30.0
+_MATCH_CACHE_SIZE = 256
+
+# Caps concurrent browser-driven work (/capture, /replay, /ui/cache-auth) across all
+# handler threads so a burst of requests cannot launch an unbounded number of sessions.
+# With several API workers, serve_api swaps in one cross-process semaphore so the
+# cap covers all of them rather than each worker.
+_JOB_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENT_JOBS)
+
+
+@lru_cache(maxsize=1)
+def _cdp_pool():
+    """CDP connections reused across /capture calls against the same tab."""
+    from .capture import CDPClientPool
+
+    return CDPClientPool()
+
+
+@lru_cache(maxsize=1)
+def _replay_session():
+    """Session shared by /replay so repeated replays to one host reuse pooled connections."""
+    from .replay import new_replay_session
+
+    return new_replay_session()
+
+
+def _write_response(
+    handler: BaseHTTPRequestHandler,
+    status: int,
+    content_type: str,
+    body: bytes,
+    close: bool = False,
+) -> None:
+    """Write a response with the status line, headers and body in a single write.
+
+    Bypasses send_response()/send_header(), which format and buffer each line
+    separately; the headers emitted are the same.
+    """
+    if close:
+        # What send_header("Connection", "close") would do: end the keep-alive loop.
+        handler.close_connection = True
+    else:
+        # Also announce a close already decided elsewhere (e.g. an unread body).
+        close = handler.close_connection
+    if handler.request_version == "HTTP/0.9":
+        handler.wfile.write(body)
+        return
+    reason = handler.responses[status][0] if status in handler.responses else ""
+    connection = "Connection: close\r\n" if close else ""
+    head = (
+        f"{handler.protocol_version} {status} {reason}\r\n"
+        f"Server: {handler.version_string()}\r\n"
+        f"Date: {handler.date_time_string()}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"{connection}\r\n"
+    )
+    handler.wfile.write(head.encode("latin-1", "strict") + body)
+
+
+def _json_response(handler: BaseHTTPRequestHandler, status: int, payload: object, close: bool = False) -> None:
+    _write_response(handler, status, "application/json", json_dumps(payload), close=close)
+
 
+_thread_buffers = threading.local()
 
-def _json_response(handler: BaseHTTPRequestHandler, status: int, payload: dict) -> None:
-    body = json.dumps(payload).encode("utf-8")
-    handler.send_response(status)
-    handler.send_header("Content-Type", "application/json")
-    handler.send_header("Content-Length", str(len(body)))
-    handler.end_headers()
-    handler.wfile.write(body)
+
+def _read_body_into_buffer(handler: BaseHTTPRequestHandler, length: int) -> memoryview:
+    """Read exactly *length* body bytes into a per-thread reusable buffer.
+
+    Keep-alive connections are served by one thread, so the buffer is reused
+    across that connection's requests. The view is only valid until the next call.
+    """
+    buf = getattr(_thread_buffers, "body", None)
+    if buf is None or len(buf) < length:
+        buf = _thread_buffers.body = bytearray(max(length, 4096))
+    view = memoryview(buf)[:length]
+    filled = 0
+    while filled < length:
+        n = handler.rfile.readinto(view[filled:])
+        if not n:
+            raise ValueError("Request body ended before Content-Length bytes were read")
+        filled += n
+    return view
 
 
 def _read_json_body(handler: BaseHTTPRequestHandler) -> dict:
-    length = int(handler.headers.get("Content-Length", "0"))
+    if handler.headers.get("Transfer-Encoding"):
+        # Chunked bodies aren't read; drop the connection so the unread bytes
+        # aren't parsed as the next keep-alive request.
+        handler.close_connection = True
+        raise ValueError("Transfer-Encoding is not supported; send Content-Length")
+    raw_length = handler.headers.get("Content-Length")
+    if raw_length == "0":
+        return {}
+    if raw_length is None:
+        # No declared length: the body (if any) can't be delimited.
+        handler.close_connection = True
+        return {}
+    try:
+        length = int(raw_length)
+    except ValueError:
+        handler.close_connection = True
+        raise ValueError(f"Invalid Content-Length: {raw_length!r}") from None
+    if length < 0:
+        handler.close_connection = True
+        raise ValueError(f"Invalid Content-Length: {raw_length!r}")
     if length > MAX_JSON_BODY_BYTES:
         raise ValueError(f"Request body too large; max {MAX_JSON_BODY_BYTES} bytes")
-    data = handler.rfile.read(length) if length > 0 else b"{}"
-    return json.loads(data.decode("utf-8"))
+    if length == 0:
+        return {}
+    body = _read_body_into_buffer(handler, length)
+    if length == 2 and body == b"{}":
+        # The UI posts a bare "{}" for argument-less calls; skip the parser.
+        return {}
+    payload = json_loads(body)
+    if not isinstance(payload, dict):
+        raise ValueError("JSON body must be an object")
+    return payload
+
+
+def _request_path(target: str) -> str:
+    """Return the path of a request target, skipping urlparse for origin-form targets."""
+    if not target.startswith("/"):
+        return urlparse(target).path
+    end = target.find("?")
+    return target if end < 0 else target[:end]
 
 
 def _validate_http_url(value: str) -> str:
+    return _parse_target_url(value)[0]
+
+
+def _parse_target_url(value: str) -> tuple[str, str]:
+    """Validate an absolute http(s) URL and return ``(url, lower-cased host)`` from one parse."""
     parsed = urlparse(value)
     if parsed.scheme not in {"http", "https"} or not parsed.netloc:
         raise ValueError("URL must be an absolute http/https URL")
-    return value
+    return value, (parsed.hostname or "").lower()
 
 
 def _is_loopback_host(host: str) -> bool:
@@ -70,14 +192,14 @@ def _enforce_local_bind(host: str) -> None:
         )
 
 
-def _safe_replay_config(config: ReplayConfig) -> dict:
-    payload = asdict(config)
-    if payload.get("encryption_key"):
-        payload["encryption_key"] = "***REDACTED***"
-    return payload
+def _safe_replay_config(config: ReplayConfig) -> ReplayConfig:
+    """Return *config* with its encryption key masked; json_dumps serializes it field by field."""
+    if config.encryption_key:
+        return replace(config, encryption_key="***REDACTED***")
+    return config
 
 
-def _is_authorized(handler: BaseHTTPRequestHandler, api_token: str | None) -> bool:
+def _is_authorized(handler: BaseHTTPRequestHandler, api_token: str | bytes | None) -> bool:
     if not api_token:
         return True
     provided = (
@@ -85,23 +207,84 @@ def _is_authorized(handler: BaseHTTPRequestHandler, api_token: str | None) -> bo
         or handler.headers.get("X-API-Key")
         or handler.headers.get("Authorization", "").removeprefix("Bearer ").strip()
     )
-    return bool(provided) and provided == api_token
+    if not provided:
+        return False
+    expected = api_token if isinstance(api_token, bytes) else api_token.encode("utf-8")
+    return hmac.compare_digest(provided.encode("utf-8"), expected)
 
 
-def _capture_sample(captures: list, redact_output: bool) -> list[dict]:
-    sample = [c.to_dict() for c in captures[:3]]
+def _limit_concurrency(route):
+    @wraps(route)
+    def wrapper(handler: BaseHTTPRequestHandler, payload: dict) -> None:
+        if not _JOB_SLOTS.acquire(timeout=JOB_SLOT_TIMEOUT_SECONDS):
+            _json_response(handler, 503, {"error": "Too many capture/replay jobs in flight; retry later"})
+            return
+        try:
+            route(handler, payload)
+        finally:
+            _JOB_SLOTS.release()
+
+    return wrapper
+
+
+def _capture_sample(captures: list, redact_output: bool) -> list:
     if not redact_output:
-        return sample
+        # json_dumps serializes CapturedRequest through to_dict() while writing.
+        return captures[:3]
+    sample = [c.to_dict() for c in captures[:3]]
     for item in sample:
-        item["headers"] = redact_headers(dict(item.get("headers", {})))
+        item["headers"] = redact_headers(item.get("headers") or {})
     return sample
 
 
+class _CaptureIndex:
+    """Captures of one file grouped by request host, keeping file order."""
+
+    def __init__(self, captures: list[CapturedRequest]) -> None:
+        self.captures = captures
+        self._has_auth = [c.has_authorization_header or c.has_cookie_header for c in captures]
+        self._by_host: dict[str, list[int]] = defaultdict(list)
+        for i, c in enumerate(captures):
+            self._by_host[c.host].append(i)
+        # Hosts come from clients, so the per-host memo is bounded; the index
+        # itself lives as long as the file is unchanged.
+        self.matching = lru_cache(maxsize=_MATCH_CACHE_SIZE)(self._matching)
+
+    def _matching(self, host: str) -> tuple[list[CapturedRequest], list[CapturedRequest]]:
+        """Return ``(matched, matched_with_auth)`` for captures whose host contains *host*.
+
+        Exposed as ``matching``, which memoizes the most recent hosts (including
+        misses for hosts never captured). Treat the returned lists as read-only.
+        """
+        hits = [positions for h, positions in self._by_host.items() if host in h]
+        positions = hits[0] if len(hits) == 1 else sorted(i for p in hits for i in p)
+        matched = [self.captures[i] for i in positions]
+        with_auth = [self.captures[i] for i in positions if self._has_auth[i]]
+        return matched, with_auth
+
+
+@lru_cache(maxsize=8)
+def _cached_index(path: str, mtime_ns: int, size: int, encryption_key: str | None) -> _CaptureIndex:
+    return _CaptureIndex(load_captures(path, encryption_key=encryption_key))
+
+
+def _load_index(path: str, encryption_key: str | None) -> _CaptureIndex:
+    """Load and index *path*, reusing the previous result while the file is unchanged."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return _CaptureIndex(load_captures(path, encryption_key=encryption_key))
+    return _cached_index(path, stat.st_mtime_ns, stat.st_size, encryption_key)
+
+
 def make_handler(api_token: str | None = None) -> type[BaseHTTPRequestHandler]:
     state_dir = Path.home() / ".cookie_monster" / "ui"
     state_dir.mkdir(parents=True, exist_ok=True)
     default_capture_file = state_dir / "captures.enc.jsonl"
     default_key_file = state_dir / "key.txt"
+    api_token_bytes = api_token.encode("utf-8") if api_token else None
+    html_bytes = page_html().encode("utf-8")
+    svg_bytes = logo_svg().encode("utf-8")
 
     def _ui_key(payload: dict) -> str:
         explicit = resolve_key(payload.get("encryption_key"), payload.get("encryption_key_env", "COOKIE_MONSTER_ENCRYPTION_KEY"))
@@ -110,241 +293,323 @@ def make_handler(api_token: str | None = None) -> type[BaseHTTPRequestHandler]:
         return load_or_create_key(str(default_key_file))
 
     class Handler(BaseHTTPRequestHandler):
+        # HTTP/1.1 keeps UI polling connections open; every response carries a
+        # Content-Length or closes the connection.
+        protocol_version = "HTTP/1.1"
+        # Idle keep-alive sockets time out.
+        timeout = 30
+        # Buffer wfile so the status line, headers and a small body leave in one send;
+        # handle_one_request()/finish() flush it after each response.
+        wbufsize = -1
+        # Small JSON replies should not wait on Nagle/delayed-ACK interplay.
+        disable_nagle_algorithm = True
+
         def log_message(self, format: str, *args) -> None:  # noqa: A003
             return
 
         def do_GET(self) -> None:  # noqa: N802
-            parsed = urlparse(self.path)
-            if parsed.path == "/ui":
-                html = page_html().encode("utf-8")
-                self.send_response(200)
-                self.send_header("Content-Type", "text/html; charset=utf-8")
-                self.send_header("Content-Length", str(len(html)))
-                self.end_headers()
-                self.wfile.write(html)
-                return
-            if parsed.path == "/ui/logo.svg":
-                svg = logo_svg().encode("utf-8")
-                self.send_response(200)
-                self.send_header("Content-Type", "image/svg+xml")
-                self.send_header("Content-Length", str(len(svg)))
-                self.end_headers()
-                self.wfile.write(svg)
-                return
-            if parsed.path == "/health":
-                _json_response(self, 200, {"ok": True})
+            route = self._GET_ROUTES.get(_request_path(self.path))
+            if route is None:
+                _json_response(self, 404, {"error": "Not found"})
                 return
-            if parsed.path == "/targets":
-                try:
-                    targets = list_page_targets("127.0.0.1", 9222)
-                    _json_response(self, 200, {"targets": targets})
-                except Exception as exc:  # noqa: BLE001
-                    _json_response(self, 500, {"error": str(exc)})
-                return
-            if parsed.path == "/session-health":
-                try:
-                    # GET /session-health?capture_file=... is intentionally omitted; use POST for explicit body.
-                    _json_response(self, 400, {"error": "Use POST /session-health with JSON body"})
-                except Exception as exc:  # noqa: BLE001
-                    _json_response(self, 500, {"error": str(exc)})
-                return
-            _json_response(self, 404, {"error": "Not found"})
+            route(self)
 
         def do_POST(self) -> None:  # noqa: N802
-            if not _is_authorized(self, api_token):
-                _json_response(self, 401, {"error": "Unauthorized"})
+            # The request body may be left unread on these early errors, so close
+            # the connection rather than parse leftover bytes as the next request.
+            if api_token_bytes is not None and not _is_authorized(self, api_token_bytes):
+                _json_response(self, 401, {"error": "Unauthorized"}, close=True)
                 return
-            parsed = urlparse(self.path)
+            path = _request_path(self.path)
             try:
                 payload = _read_json_body(self)
             except Exception as exc:  # noqa: BLE001
-                _json_response(self, 400, {"error": f"Invalid JSON: {exc}"})
+                _json_response(self, 400, {"error": f"Invalid JSON: {exc}"}, close=True)
                 return
-
-            if parsed.path == "/capture":
-                try:
-                    config = CaptureConfig(**payload)
-                    captures = capture_requests(config)
-                    _json_response(
-                        self,
-                        200,
-                        {
-                            "captured": len(captures),
-                            "output": config.output_file,
-                            "sample": _capture_sample(
-                                captures,
-                                redact_output=bool(payload.get("redact_output", True)),
-                            ),
-                        },
-                    )
-                except Exception as exc:  # noqa: BLE001
-                    _json_response(self, 500, {"error": str(exc)})
+            route = self._POST_ROUTES.get(path)
+            if route is None:
+                _json_response(self, 404, {"error": "Not found"})
                 return
+            route(self, payload)
 
-            if parsed.path == "/replay":
-                try:
-                    config = ReplayConfig(**payload)
-                    response = replay_with_capture(config)
-                    _json_response(
-                        self,
-                        200,
-                        {
-                            "status_code": response.status_code,
-                            "content_type": response.headers.get("Content-Type", ""),
-                            "body_preview": response.text[:400],
-                            "config": _safe_replay_config(config),
-                        },
-                    )
-                except Exception as exc:  # noqa: BLE001
-                    _json_response(self, 500, {"error": str(exc)})
-                return
+        # ---- GET routes ----
 
-            if parsed.path == "/session-health":
-                try:
-                    capture_file = str(payload["capture_file"])
-                    key = resolve_key(payload.get("encryption_key"), payload.get("encryption_key_env", "COOKIE_MONSTER_ENCRYPTION_KEY"))
-                    captures = load_captures(capture_file, encryption_key=key)
-                    health = analyze_session_health(captures)
-                    _json_response(
-                        self,
-                        200,
-                        {
-                            "has_cookie": health.has_cookie,
-                            "bearer_token_count": health.bearer_token_count,
-                            "jwt_expired": health.jwt_expired,
-                            "jwt_expires_at": health.jwt_expires_at,
-                        },
-                    )
-                except Exception as exc:  # noqa: BLE001
-                    _json_response(self, 500, {"error": str(exc)})
-                return
+        def _get_ui(self) -> None:
+            _write_response(self, 200, "text/html; charset=utf-8", html_bytes)
 
-            if parsed.path == "/diff":
-                try:
-                    diff = compare_capture_files(
-                        str(payload["a"]),
-                        str(payload["b"]),
-                        encryption_key_a=payload.get("a_key"),
-                        encryption_key_b=payload.get("b_key"),
-                    )
-                    _json_response(
-                        self,
-                        200,
-                        {
-                            "headers_added": diff.headers_added,
-                            "headers_removed": diff.headers_removed,
-                            "method_changed": diff.method_changed,
-                        },
-                    )
-                except Exception as exc:  # noqa: BLE001
-                    _json_response(self, 500, {"error": str(exc)})
-                return
+        def _get_logo(self) -> None:
+            _write_response(self, 200, "image/svg+xml", svg_bytes)
 
-            if parsed.path == "/ui/cache-auth":
-                try:
-                    target_url = _validate_http_url(str(payload["url"]))
-                    browser = str(payload.get("browser", "chrome"))
-                    profile_directory = str(payload.get("profile_directory", "Default"))
-                    user_data_dir = payload.get("user_data_dir") or default_user_data_dir(browser)
-                    if not user_data_dir:
-                        raise RuntimeError("Could not determine browser user_data_dir; provide user_data_dir")
-
-                    key = _ui_key(payload)
-                    adapter = auto_detect_adapter(target_url)
-                    defaults = adapter.defaults() if adapter else None
-
-                    with BrowserSession(
-                        BrowserLaunchConfig(
-                            browser=browser,
-                            user_data_dir=str(user_data_dir),
-                            profile_directory=profile_directory,
-                            open_url=target_url,
-                            headless=bool(payload.get("headless", False)),
-                        )
-                    ):
-                        captures = capture_requests(
-                            CaptureConfig(
-                                duration_seconds=int(payload.get("duration_seconds", 12)),
-                                max_records=int(payload.get("max_records", 100)),
-                                target_hint=(defaults.target_hint if defaults else url_host(target_url)),
-                                include_all_headers=True,
-                                filter_host_contains=(defaults.filter_host_contains if defaults else url_host(target_url)),
-                                output_file=str(payload.get("capture_file") or default_capture_file),
-                                encryption_key=key,
-                            )
+        def _get_health(self) -> None:
+            _json_response(self, 200, {"ok": True})
+
+        def _get_targets(self) -> None:
+            try:
+                targets = list_page_targets("127.0.0.1", 9222)
+                _json_response(self, 200, {"targets": targets})
+            except Exception as exc:  # noqa: BLE001
+                _json_response(self, 500, {"error": str(exc)})
+
+        def _get_session_health(self) -> None:
+            # GET /session-health?capture_file=... is intentionally omitted; use POST for explicit body.
+            _json_response(self, 400, {"error": "Use POST /session-health with JSON body"})
+
+        # ---- POST routes ----
+
+        @_limit_concurrency
+        def _post_capture(self, payload: dict) -> None:
+            from .capture import capture_requests
+
+            try:
+                config = CaptureConfig(**payload)
+                captures = capture_requests(config, pool=_cdp_pool())
+                _json_response(
+                    self,
+                    200,
+                    {
+                        "captured": len(captures),
+                        "output": config.output_file,
+                        "sample": _capture_sample(
+                            captures,
+                            redact_output=bool(payload.get("redact_output", True)),
+                        ),
+                    },
+                )
+            except Exception as exc:  # noqa: BLE001
+                _json_response(self, 500, {"error": str(exc)})
+
+        @_limit_concurrency
+        def _post_replay(self, payload: dict) -> None:
+            from .replay import body_preview, replay_with_capture
+
+            try:
+                config = ReplayConfig(**payload)
+                response = replay_with_capture(config, session=_replay_session())
+                _json_response(
+                    self,
+                    200,
+                    {
+                        "status_code": response.status_code,
+                        "content_type": response.headers.get("Content-Type", ""),
+                        "body_preview": body_preview(response),
+                        "config": _safe_replay_config(config),
+                    },
+                )
+            except Exception as exc:  # noqa: BLE001
+                _json_response(self, 500, {"error": str(exc)})
+
+        def _post_session_health(self, payload: dict) -> None:
+            from .session_health import analyze_session_health
+
+            try:
+                capture_file = str(payload["capture_file"])
+                key = resolve_key(payload.get("encryption_key"), payload.get("encryption_key_env", "COOKIE_MONSTER_ENCRYPTION_KEY"))
+                health = analyze_session_health(_load_index(capture_file, key).captures)
+                # SessionHealthResult's fields are the response keys.
+                _json_response(self, 200, health)
+            except Exception as exc:  # noqa: BLE001
+                _json_response(self, 500, {"error": str(exc)})
+
+        def _post_diff(self, payload: dict) -> None:
+            from .diffing import compare_capture_files
+
+            try:
+                diff = compare_capture_files(
+                    str(payload["a"]),
+                    str(payload["b"]),
+                    encryption_key_a=payload.get("a_key"),
+                    encryption_key_b=payload.get("b_key"),
+                )
+                # CaptureDiff's fields are the response keys.
+                _json_response(self, 200, diff)
+            except Exception as exc:  # noqa: BLE001
+                _json_response(self, 500, {"error": str(exc)})
+
+        @_limit_concurrency
+        def _post_cache_auth(self, payload: dict) -> None:
+            from .browser_session import BrowserLaunchConfig, BrowserSession
+            from .capture import capture_requests
+            from .plugins import auto_detect_adapter
+
+            try:
+                target_url, target_host = _parse_target_url(str(payload["url"]))
+                browser = str(payload.get("browser", "chrome"))
+                profile_directory = str(payload.get("profile_directory", "Default"))
+                user_data_dir = payload.get("user_data_dir") or default_user_data_dir(browser)
+                if not user_data_dir:
+                    raise RuntimeError("Could not determine browser user_data_dir; provide user_data_dir")
+
+                key = _ui_key(payload)
+                adapter = auto_detect_adapter(target_url)
+                defaults = adapter.defaults() if adapter else None
+
+                with BrowserSession(
+                    BrowserLaunchConfig(
+                        browser=browser,
+                        user_data_dir=str(user_data_dir),
+                        profile_directory=profile_directory,
+                        open_url=target_url,
+                        headless=bool(payload.get("headless", False)),
+                    )
+                ):
+                    captures = capture_requests(
+                        CaptureConfig(
+                            duration_seconds=int(payload.get("duration_seconds", 12)),
+                            max_records=int(payload.get("max_records", 100)),
+                            target_hint=(defaults.target_hint if defaults else target_host),
+                            include_all_headers=True,
+                            filter_host_contains=(defaults.filter_host_contains if defaults else target_host),
+                            output_file=str(payload.get("capture_file") or default_capture_file),
+                            encryption_key=key,
                         )
-                    _json_response(
-                        self,
-                        200,
-                        {
-                            "captured": len(captures),
-                            "capture_file": str(payload.get("capture_file") or default_capture_file),
-                            "encrypted": True,
-                            "adapter": adapter.name if adapter else None,
-                        },
                     )
-                except Exception as exc:  # noqa: BLE001
-                    _json_response(self, 500, {"error": str(exc)})
-                return
+                _json_response(
+                    self,
+                    200,
+                    {
+                        "captured": len(captures),
+                        "capture_file": str(payload.get("capture_file") or default_capture_file),
+                        "encrypted": True,
+                        "adapter": adapter.name if adapter else None,
+                    },
+                )
+            except Exception as exc:  # noqa: BLE001
+                _json_response(self, 500, {"error": str(exc)})
 
-            if parsed.path == "/ui/check-auth":
-                try:
-                    target_url = _validate_http_url(str(payload["url"]))
-                    host = url_host(target_url)
-                    key = _ui_key(payload)
-                    capture_file = str(payload.get("capture_file") or default_capture_file)
-                    captures = load_captures(capture_file, encryption_key=key)
-                    matched = [c for c in captures if host in url_host(c.url)]
-                    auth_count = 0
-                    for c in matched:
-                        lower = {k.lower() for k in c.headers}
-                        if "authorization" in lower or "cookie" in lower:
-                            auth_count += 1
-                    _json_response(
-                        self,
-                        200,
-                        {
-                            "url_host": host,
-                            "capture_file": capture_file,
-                            "matched_records": len(matched),
-                            "records_with_auth_headers": auth_count,
-                            "has_cached_auth": auth_count > 0,
-                        },
-                    )
-                except Exception as exc:  # noqa: BLE001
-                    _json_response(self, 500, {"error": str(exc)})
-                return
+        def _post_check_auth(self, payload: dict) -> None:
+            try:
+                _, host = _parse_target_url(str(payload["url"]))
+                key = _ui_key(payload)
+                capture_file = str(payload.get("capture_file") or default_capture_file)
+                index = _load_index(capture_file, key)
+                matched, with_auth = index.matching(host)
+                auth_count = len(with_auth)
+                _json_response(
+                    self,
+                    200,
+                    {
+                        "url_host": host,
+                        "capture_file": capture_file,
+                        "matched_records": len(matched),
+                        "records_with_auth_headers": auth_count,
+                        "has_cached_auth": auth_count > 0,
+                    },
+                )
+            except Exception as exc:  # noqa: BLE001
+                _json_response(self, 500, {"error": str(exc)})
 
-            if parsed.path == "/ui/inspect-auth":
-                try:
-                    target_url = _validate_http_url(str(payload["url"]))
-                    host = url_host(target_url)
-                    key = _ui_key(payload)
-                    capture_file = str(payload.get("capture_file") or default_capture_file)
-                    captures = load_captures(capture_file, encryption_key=key)
-                    matched = [c for c in captures if host in url_host(c.url)]
-                    def has_auth_headers(cap) -> bool:
-                        lower = {k.lower() for k in cap.headers.keys()}
-                        return "authorization" in lower or "cookie" in lower
-                    prioritized = [c for c in matched if has_auth_headers(c)]
-                    if not prioritized:
-                        prioritized = matched
-                    out = []
-                    for c in prioritized[-20:]:
-                        item = c.to_dict()
-                        item["headers"] = redact_headers(dict(item.get("headers", {})))
-                        out.append(item)
-                    _json_response(self, 200, {"url_host": host, "capture_file": capture_file, "records": out})
-                except Exception as exc:  # noqa: BLE001
-                    _json_response(self, 500, {"error": str(exc)})
+        def _post_inspect_auth(self, payload: dict) -> None:
+            try:
+                _, host = _parse_target_url(str(payload["url"]))
+                key = _ui_key(payload)
+                capture_file = str(payload.get("capture_file") or default_capture_file)
+                index = _load_index(capture_file, key)
+                matched, with_auth = index.matching(host)
+                prioritized = with_auth or matched
+                records = []
+                for c in prioritized[-20:]:
+                    item = c.to_dict()
+                    item["headers"] = redact_headers(item.get("headers") or {})
+                    records.append(item)
+            except Exception as exc:  # noqa: BLE001
+                _json_response(self, 500, {"error": str(exc)})
                 return
-
-            _json_response(self, 404, {"error": "Not found"})
+            _json_response(self, 200, {"url_host": host, "capture_file": capture_file, "records": records})
+
+        _GET_ROUTES = {
+            "/ui": _get_ui,
+            "/ui/logo.svg": _get_logo,
+            "/health": _get_health,
+            "/targets": _get_targets,
+            "/session-health": _get_session_health,
+        }
+        _POST_ROUTES = {
+            "/capture": _post_capture,
+            "/replay": _post_replay,
+            "/session-health": _post_session_health,
+            "/diff": _post_diff,
+            "/ui/cache-auth": _post_cache_auth,
+            "/ui/check-auth": _post_check_auth,
+            "/ui/inspect-auth": _post_inspect_auth,
+        }
 
     return Handler
 
 
-def serve_api(host: str = "127.0.0.1", port: int = 8787, api_token: str | None = None) -> None:
-    _enforce_local_bind(host)
-    server = ThreadingHTTPServer((host, port), make_handler(api_token=api_token))
+class _APIServer(ThreadingHTTPServer):
+    # socketserver's default listen backlog of 5 refuses connections when the UI
+    # fires several polls while a long /capture or /ui/cache-auth is in flight.
+    request_queue_size = 128
+    reuse_port = False
+
+    def server_bind(self) -> None:
+        if self.reuse_port:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+class _ReusePortAPIServer(_APIServer):
+    reuse_port = True
+
+
+def _api_workers() -> int:
+    raw = os.getenv("COOKIE_MONSTER_API_WORKERS", "").strip()
+    if not raw:
+        return 1
+    try:
+        return max(1, int(raw))
+    except ValueError as exc:
+        raise RuntimeError("COOKIE_MONSTER_API_WORKERS must be an integer") from exc
+
+
+def _run_server(
+    host: str,
+    port: int,
+    api_token: str | None,
+    server_cls: type[_APIServer],
+    job_slots: ProcessSemaphore | None = None,
+) -> None:
+    if job_slots is not None:
+        global _JOB_SLOTS
+        _JOB_SLOTS = job_slots
+    server = server_cls((host, port), make_handler(api_token=api_token))
     server.serve_forever()
+
+
+def serve_api(
+    host: str = "127.0.0.1",
+    port: int = 8787,
+    api_token: str | None = None,
+    workers: int | None = None,
+) -> None:
+    """Serve the HTTP API, optionally across *workers* processes sharing the port.
+
+    *workers* defaults to ``COOKIE_MONSTER_API_WORKERS`` (or 1). More than one
+    worker needs ``SO_REUSEPORT`` so the kernel spreads connections across
+    processes; each worker keeps its own capture cache, but ``MAX_CONCURRENT_JOBS``
+    is shared, so it caps browser jobs across all workers.
+    """
+    _enforce_local_bind(host)
+    workers = _api_workers() if workers is None else max(1, workers)
+    if workers == 1:
+        _run_server(host, port, api_token, _APIServer)
+        return
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("Multiple API workers require SO_REUSEPORT, which this platform lacks")
+
+    job_slots = multiprocessing.BoundedSemaphore(MAX_CONCURRENT_JOBS)
+    procs = [
+        multiprocessing.Process(
+            target=_run_server,
+            args=(host, port, api_token, _ReusePortAPIServer, job_slots),
+            daemon=True,
+        )
+        for _ in range(workers - 1)
+    ]
+    for proc in procs:
+        proc.start()
+    try:
+        _run_server(host, port, api_token, _ReusePortAPIServer, job_slots)
+    finally:
+        for proc in procs:
+            proc.terminate()
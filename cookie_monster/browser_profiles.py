@@ -1,39 +1,52 @@
 from __future__ import annotations
 
-import json
 import os
 import platform
+from functools import lru_cache
 from pathlib import Path
 
+from .json_utils import loads as json_loads
+
+# (browser, system) -> existing user data dir. Only hits are kept, so a profile
+# directory created while a long-lived process (the API server) runs is still found.
+_default_dirs: dict[tuple[str, str], str] = {}
+
 
 def default_user_data_dir(browser: str) -> str | None:
     browser = browser.lower()
     system = platform.system().lower()
+    key = (browser, system)
+    path = _default_dirs.get(key)
+    if path is not None:
+        return path
     home = str(Path.home())
     if "darwin" in system:
         roots = {
             "chrome": f"{home}/Library/Application Support/Google/Chrome",
             "edge": f"{home}/Library/Application Support/Microsoft Edge",
         }
-        path = roots.get(browser)
-        return path if path and Path(path).exists() else None
-    if "windows" in system:
+    elif "windows" in system:
         local = os.path.expandvars(r"%LocalAppData%")
         roots = {
             "chrome": f"{local}\\Google\\Chrome\\User Data",
             "edge": f"{local}\\Microsoft\\Edge\\User Data",
         }
-        path = roots.get(browser)
-        return path if path and Path(path).exists() else None
-    return None
-
+    else:
+        return None
+    path = roots.get(browser)
+    if not path or not Path(path).exists():
+        return None
+    _default_dirs[key] = path
+    return path
 
-def list_profiles(user_data_dir: str) -> list[dict[str, str]]:
-    local_state = Path(user_data_dir) / "Local State"
-    if not local_state.exists():
-        raise FileNotFoundError(f"Local State not found in {user_data_dir}")
 
-    data = json.loads(local_state.read_text(encoding="utf-8"))
+@lru_cache(maxsize=8)
+def _cached_profiles(
+    local_state: str, mtime_ns: int, size: int
+) -> tuple[dict[str, str], ...]:
+    # mtime_ns/size only key the cache: Chrome rewriting Local State changes
+    # them, which drops the stale entry.
+    data = json_loads(Path(local_state).read_bytes())
     info_cache = data.get("profile", {}).get("info_cache", {})
     profiles: list[dict[str, str]] = []
     for profile_dir, details in info_cache.items():
@@ -44,7 +57,39 @@ def list_profiles(user_data_dir: str) -> list[dict[str, str]]:
                 "email": str(details.get("user_name") or details.get("gaia_name") or ""),
             }
         )
-    return sorted(profiles, key=lambda p: p["profile_directory"])
+    return tuple(sorted(profiles, key=lambda p: p["profile_directory"]))
+
+
+@lru_cache(maxsize=8)
+def _cached_profile_index(local_state: str, mtime_ns: int, size: int) -> dict[str, str]:
+    """Map lowercased email and display name to profile directory.
+
+    Built in directory order with first-wins semantics, matching the old
+    linear scan.
+    """
+    index: dict[str, str] = {}
+    for p in _cached_profiles(local_state, mtime_ns, size):
+        if p["email"]:
+            index.setdefault(p["email"].lower(), p["profile_directory"])
+        index.setdefault(p["name"].lower(), p["profile_directory"])
+    return index
+
+
+def _local_state_key(user_data_dir: str) -> tuple[str, int, int]:
+    local_state = Path(user_data_dir) / "Local State"
+    try:
+        st = local_state.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Local State not found in {user_data_dir}") from None
+    return str(local_state), st.st_mtime_ns, st.st_size
+
+
+def _load_profiles(user_data_dir: str) -> tuple[dict[str, str], ...]:
+    return _cached_profiles(*_local_state_key(user_data_dir))
+
+
+def list_profiles(user_data_dir: str) -> list[dict[str, str]]:
+    return [dict(p) for p in _load_profiles(user_data_dir)]
 
 
 def resolve_profile(
@@ -83,15 +128,12 @@ def resolve_profile(
             f"the default {browser} data directory."
         )
 
-    profiles = list_profiles(data_dir)
-    needle = email.strip().lower()
-    for p in profiles:
-        if (
-            (p["email"] and p["email"].lower() == needle)
-            or p["name"].lower() == needle
-        ):
-            return data_dir, p["profile_directory"]
+    key = _local_state_key(data_dir)
+    profile_dir = _cached_profile_index(*key).get(email.strip().lower())
+    if profile_dir is not None:
+        return data_dir, profile_dir
 
+    profiles = _cached_profiles(*key)
     available = ", ".join(
         f"{p['name']} / {p['email']} ({p['profile_directory']})" for p in profiles
     )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from subprocess import Popen
+from subprocess import Popen, TimeoutExpired
 
 from .chrome_launcher import launch_browser, wait_for_debug_endpoint
 
@@ -19,6 +19,9 @@ class BrowserLaunchConfig:
 
 
 class BrowserSession:
+    # How long close() waits for the browser to exit after SIGTERM before killing it.
+    TERMINATE_TIMEOUT_SECONDS = 2.0
+
     def __init__(self, config: BrowserLaunchConfig) -> None:
         self.config = config
         self._proc: Popen[bytes] | None = None
@@ -42,6 +45,12 @@ class BrowserSession:
         return False
 
     def close(self) -> None:
+        """Stop the browser and reap it so its debug port and profile lock are released."""
         if self._proc is not None:
-            self._proc.terminate()
-            self._proc = None
+            proc, self._proc = self._proc, None
+            proc.terminate()
+            try:
+                proc.wait(timeout=self.TERMINATE_TIMEOUT_SECONDS)
+            except TimeoutExpired:
+                proc.kill()
+                proc.wait()
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import threading
 import time
+from collections.abc import Callable, Mapping
+from contextlib import suppress
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlsplit
 
 from .cdp import CDPClient
 from .chrome_discovery import get_websocket_debug_url
@@ -11,14 +16,50 @@ from .models import CapturedRequest
 from .storage import append_captures
 from .tab_manager import TabManager, TabManagerConfig
 
+# Captures are appended to the output file in chunks of this many records, or
+# after this many seconds, whichever comes first.
+_FLUSH_EVERY_RECORDS = 256
+_FLUSH_INTERVAL_SECONDS = 1.0
+
+# Read-only stand-in for absent CDP params/request/headers, so a missing field
+# doesn't allocate a fresh dict per event.
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# Network.enable parameters. Capture never reads response bodies, so Chrome is
+# told to keep only small body buffers for this session.
+_NETWORK_ENABLE_PARAMS: dict[str, Any] = {
+    "maxTotalBufferSize": 10_000_000,
+    "maxResourceBufferSize": 5_000_000,
+}
+
+_REQUEST_WILL_BE_SENT = "Network.requestWillBeSent"
+_REQUEST_EXTRA_INFO = "Network.requestWillBeSentExtraInfo"
+_CAPTURE_EVENTS = (_REQUEST_WILL_BE_SENT, _REQUEST_EXTRA_INFO)
+
 # ── extract helpers ───────────────────────────────────────────────────────────
 
 
 def audience_domain(url: str) -> str:
     """Extract the domain (netloc) from a URL for audience correlation."""
+    # Fast path for plain http(s) URLs: the netloc runs from "://" to the next
+    # "/", "?" or "#". urlsplit strips tab/CR/LF and validates bracketed IPv6
+    # hosts, so URLs containing those still go through it.
+    if (
+        url.startswith(("https://", "http://"))
+        and "[" not in url
+        and "\t" not in url
+        and "\n" not in url
+        and "\r" not in url
+    ):
+        start = url.index("://") + 3
+        end = len(url)
+        for sep in "/?#":
+            i = url.find(sep, start, end)
+            if i != -1:
+                end = i
+        return url[start:end] or url
     try:
-        parsed = urlparse(url)
-        return parsed.netloc or url
+        return urlsplit(url).netloc or url
     except Exception:  # noqa: BLE001
         return url
 
@@ -34,17 +75,16 @@ def extract_tokens(
     (case-insensitive).  Returns ``{key_lower: value_or_None}``.
     """
     result: dict[str, str | None] = {k.lower(): None for k in extract_keys}
+    # One pass over each entry's headers, lowering each name once, instead of
+    # rescanning the headers for every requested key.
+    missing = set(result)
     for entry in captures:
-        headers = entry.get("headers", {})
-        for key in extract_keys:
-            low = key.lower()
-            if result.get(low) is not None:
-                continue
-            for hk, hv in headers.items():
-                if hk.lower() == low:
-                    result[low] = hv
-                    break
-        if all(v is not None for v in result.values()):
+        for hk, hv in entry.get("headers", _EMPTY).items():
+            low = hk.lower()
+            if low in missing and hv is not None:
+                result[low] = hv
+                missing.discard(low)
+        if not missing:
             break
     return result
 
@@ -74,16 +114,23 @@ def extract_token_details(
     details: list[dict[str, str]] = []
     seen: set[tuple[str, str, str]] = set()  # (header, value, domain)
 
+    # Captures repeat the same URLs; parse each distinct one once.
+    domains: dict[str, str] = {}
+
     for entry in captures:
         req_url = entry.get("url", "")
         req_method = entry.get("method", "GET")
-        domain = audience_domain(req_url)
-        headers = entry.get("headers", {})
+        domain = None
+        headers = entry.get("headers", _EMPTY)
 
         for hk, hv in headers.items():
             low = hk.lower()
             if low not in wanted:
                 continue
+            if domain is None:
+                domain = domains.get(req_url)
+                if domain is None:
+                    domain = domains[req_url] = audience_domain(req_url)
             dedup_key = (low, hv, domain)
             if dedup_key in seen:
                 continue
@@ -102,53 +149,75 @@ def extract_token_details(
 # ── header helpers ────────────────────────────────────────────────────────────
 
 
-def _normalize_headers(headers: dict[str, Any]) -> dict[str, str]:
+def _normalize_headers(headers: Mapping[str, Any]) -> dict[str, str]:
     return {str(k): str(v) for k, v in headers.items()}
 
 
 def _normalize_post_data(value: Any, max_bytes: int) -> str | None:
     if value is None:
         return None
-    raw = str(value).encode("utf-8")
+    text = str(value)
+    # UTF-8 needs at most 4 bytes per code point, so short bodies fit without encoding.
+    if len(text) * 4 <= max_bytes:
+        return text
+    raw = text.encode("utf-8")
     if len(raw) <= max_bytes:
-        return str(value)
+        return text
     return raw[:max_bytes].decode("utf-8", errors="ignore")
 
 
 def _filter_headers(
     headers: dict[str, str],
-    allowlist: list[str],
+    allowed: frozenset[str],
     include_all_headers: bool,
 ) -> dict[str, str]:
+    """Keep headers whose lowercased name is in *allowed* (already lowercased)."""
     if include_all_headers:
         return headers
 
-    allowed = {h.lower() for h in allowlist}
     return {k: v for k, v in headers.items() if k.lower() in allowed}
 
 
-def _request_matches_filters(
-    url: str,
-    method: str,
-    resource_type: str | None,
-    host_contains: str | None,
-    path_contains: str | None,
-    filter_method: str | None,
-    filter_resource_type: str | None,
-) -> bool:
-    if host_contains:
-        host = (urlparse(url).hostname or "").lower()
-        if host_contains.lower() not in host:
+@lru_cache(maxsize=4096)
+def _url_parts(url: str) -> tuple[str, str]:
+    """Return ``(host, path)`` of *url*, both lower-cased; memoized per URL.
+
+    Pages tend to hit the same endpoints repeatedly, so the cache saves a
+    parse per repeated request.
+    """
+    parsed = urlparse(url)
+    return (parsed.hostname or "").lower(), parsed.path.lower()
+
+
+def _make_request_filter(config: CaptureConfig) -> Callable[[str, str, str | None], bool]:
+    """Build a ``(url, method, resource_type) -> bool`` predicate for *config*'s filters.
+
+    Only the filters that are set are checked, with their needles normalized
+    once here rather than on every request.
+    """
+    host_contains = config.filter_host_contains.lower() if config.filter_host_contains else None
+    path_contains = config.filter_path_contains.lower() if config.filter_path_contains else None
+    method_upper = config.filter_method.upper() if config.filter_method else None
+    resource_lower = config.filter_resource_type.lower() if config.filter_resource_type else None
+
+    if not (host_contains or path_contains or method_upper or resource_lower):
+        return lambda url, method, rtype: True
+
+    def matches(url: str, method: str, rtype: str | None) -> bool:
+        # Cheap string compares first; the URL is only parsed if they pass.
+        if method_upper and method.upper() != method_upper:
             return False
-    if path_contains:
-        path = urlparse(url).path.lower()
-        if path_contains.lower() not in path:
+        if resource_lower and (rtype or "").lower() != resource_lower:
             return False
-    if filter_method and method.upper() != filter_method.upper():
-        return False
-    if filter_resource_type and (resource_type or "").lower() != filter_resource_type.lower():
-        return False
-    return True
+        if host_contains or path_contains:
+            host, path = _url_parts(url)
+            if host_contains and host_contains not in host:
+                return False
+            if path_contains and path_contains not in path:
+                return False
+        return True
+
+    return matches
 
 
 def _refresh_target_tab(config: CaptureConfig) -> None:
@@ -177,16 +246,159 @@ def _refresh_target_tab(config: CaptureConfig) -> None:
             mgr.refresh(target_id, ignore_cache=config.ignore_cache)
 
 
-def capture_requests(config: CaptureConfig) -> list[CapturedRequest]:
+class _ReqState:
+    """What has been seen so far of one in-flight request."""
+
+    __slots__ = ("request_id", "method", "url", "resource_type", "headers", "post_data", "matched")
+
+    def __init__(self, request_id: str) -> None:
+        self.request_id = request_id
+        self.method = "GET"
+        self.url = ""
+        self.resource_type: str | None = None
+        self.headers: dict[str, str] = {}
+        self.post_data: str | None = None
+        # Set once requestWillBeSent passed the target hint and filters.
+        self.matched = False
+
+
+def _build_capture(
+    state: _ReqState,
+    allowed: frozenset[str],
+    has_target_hint: bool,
+    matches_filters: Callable[[str, str, str | None], bool],
+    config: CaptureConfig,
+    client: CDPClient,
+) -> CapturedRequest | None:
+    """Return the capture for *state* if it is emittable yet, else ``None``."""
+    headers = state.headers
+    if not headers:
+        return None
+
+    filtered = _filter_headers(headers, allowed, config.include_all_headers)
+    if not filtered:
+        return None
+    if filtered is headers:
+        # Don't hand out the state's own dict.
+        filtered = dict(headers)
+
+    # requestWillBeSent already checked the target hint and filters. A state only
+    # seen through ExtraInfo has no URL, so it can't contain a hint.
+    if not state.matched:
+        if has_target_hint or not matches_filters(state.url, state.method, state.resource_type):
+            return None
+
+    post_data = None
+    if config.capture_post_data:
+        post_data = state.post_data
+        if post_data is None:
+            try:
+                result = client.send_command(
+                    "Network.getRequestPostData",
+                    {"requestId": state.request_id},
+                )
+                post_data = _normalize_post_data(
+                    result.get("postData"),
+                    max(0, int(config.max_post_data_bytes)),
+                )
+            except Exception:  # noqa: BLE001
+                post_data = None
+
+    return CapturedRequest(
+        request_id=state.request_id,
+        method=state.method,
+        url=state.url,
+        headers=filtered,
+        resource_type=state.resource_type,
+        post_data=post_data,
+    )
+
+
+class CDPClientPool:
+    """Connected CDP clients kept between captures of the same target.
+
+    A pooled client is handed to one capture at a time. :meth:`acquire` returns
+    it with the Network domain enabled, reconnecting if the pooled socket died
+    (for example because the tab or browser went away).
+    """
+
+    def __init__(self, max_idle_per_target: int = 2) -> None:
+        self.max_idle_per_target = max_idle_per_target
+        self._idle: dict[str, list[CDPClient]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, ws_url: str) -> CDPClient:
+        with self._lock:
+            idle = self._idle.get(ws_url)
+            client = idle.pop() if idle else None
+        if client is not None:
+            try:
+                client.send_command("Network.enable", _NETWORK_ENABLE_PARAMS)
+                return client
+            except Exception:  # noqa: BLE001
+                client.close()
+        client = CDPClient(ws_url)
+        client.connect()
+        try:
+            client.send_command("Network.enable", _NETWORK_ENABLE_PARAMS)
+        except Exception:
+            client.close()
+            raise
+        return client
+
+    def release(self, client: CDPClient) -> None:
+        """Return *client* for reuse. Network.disable's reply is read after any
+        in-flight events, which are then dropped, so the next capture starts clean."""
+        try:
+            client.send_command("Network.disable", {})
+        except Exception:  # noqa: BLE001
+            client.close()
+            return
+        client.clear_events()
+        with self._lock:
+            idle = self._idle.setdefault(client.websocket_url, [])
+            if len(idle) < self.max_idle_per_target:
+                idle.append(client)
+                return
+        client.close()
+
+    def close(self) -> None:
+        with self._lock:
+            clients = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for client in clients:
+            client.close()
+
+
+def capture_requests(config: CaptureConfig, pool: CDPClientPool | None = None) -> list[CapturedRequest]:
+    """Capture matching requests from the target tab and append them to ``config.output_file``.
+
+    With *pool*, the CDP connection is borrowed from and returned to it instead
+    of being opened and closed for this call.
+    """
     ws_url = get_websocket_debug_url(config.chrome_host, config.chrome_port, config.target_hint)
-    client = CDPClient(ws_url)
-    request_state: dict[str, dict[str, Any]] = {}
+    request_state: dict[str, _ReqState] = {}
     captured: list[CapturedRequest] = []
     emitted_request_ids: set[str] = set()
 
-    client.connect()
+    allowed = frozenset(h.lower() for h in config.header_allowlist)
+    hint_lower = config.target_hint.lower() if config.target_hint else None
+    matches_filters = _make_request_filter(config)
+    capture_post_data = config.capture_post_data
+    max_post_bytes = max(0, int(config.max_post_data_bytes))
+
+    if pool is not None:
+        client = pool.acquire(ws_url)
+    else:
+        client = CDPClient(ws_url)
+        client.connect()
+    reusable = False
+    # captured[:flushed] is already on disk; flushing as we go bounds how much a
+    # killed process loses on a long capture.
+    flushed = 0
     try:
-        client.send_command("Network.enable", {})
+        if pool is None:
+            client.send_command("Network.enable", _NETWORK_ENABLE_PARAMS)
 
         # If --refresh-tab is set, refresh the matched tab to trigger network
         # traffic instead of waiting for the user to navigate manually.
@@ -194,118 +406,88 @@ def capture_requests(config: CaptureConfig) -> list[CapturedRequest]:
             _refresh_target_tab(config)
 
         deadline = time.time() + config.duration_seconds
+        last_flush = time.time()
         while time.time() < deadline and len(captured) < config.max_records:
-            message = client.read_event(timeout_seconds=1.0)
-            if not message:
-                continue
-
-            method = str(message.get("method", ""))
-            params = dict(message.get("params", {}))
-
-            if method == "Network.requestWillBeSent":
-                request_id = str(params.get("requestId", ""))
-                request = dict(params.get("request", {}))
-                url = str(request.get("url", ""))
-                if config.target_hint and config.target_hint.lower() not in url.lower():
-                    continue
-                req_method = str(request.get("method", "GET"))
-                req_resource_type = str(params.get("type")) if params.get("type") is not None else None
-                if not _request_matches_filters(
-                    url=url,
-                    method=req_method,
-                    resource_type=req_resource_type,
-                    host_contains=config.filter_host_contains,
-                    path_contains=config.filter_path_contains,
-                    filter_method=config.filter_method,
-                    filter_resource_type=config.filter_resource_type,
-                ):
-                    continue
-
-                state = request_state.setdefault(request_id, {})
-                state["request_id"] = request_id
-                state["method"] = req_method
-                state["url"] = url
-                state["resource_type"] = params.get("type")
-                if config.capture_post_data:
-                    state["post_data"] = _normalize_post_data(
-                        request.get("postData"), max(0, int(config.max_post_data_bytes))
-                    )
-                state.setdefault("headers", {}).update(
-                    _normalize_headers(dict(request.get("headers", {})))
-                )
-
-            elif method == "Network.requestWillBeSentExtraInfo":
-                request_id = str(params.get("requestId", ""))
-                state = request_state.setdefault(request_id, {"request_id": request_id})
-                state.setdefault("headers", {}).update(
-                    _normalize_headers(dict(params.get("headers", {})))
-                )
-
-            for request_id, state in list(request_state.items()):
+            # Apply every frame already waiting on the socket, then evaluate each
+            # request touched by the batch once, in first-touched order. Only
+            # requests that have headers can emit, so only those are queued.
+            dirty: dict[str, None] = {}
+            for message in client.read_events(timeout_seconds=1.0, methods=_CAPTURE_EVENTS):
+                # read_events() only returns _CAPTURE_EVENTS, so this is one of the two.
+                method = message["method"]
+                # CDP messages are freshly decoded and owned by this loop; no defensive copies.
+                params = message.get("params") or _EMPTY
+
+                # CDP ids, methods, URLs and types are JSON strings already.
+                request_id = params.get("requestId", "")
                 if request_id in emitted_request_ids:
                     continue
-                headers = dict(state.get("headers", {}))
-                if not headers:
-                    continue
-
-                filtered = _filter_headers(headers, config.header_allowlist, config.include_all_headers)
-                if not filtered:
-                    continue
-
-                url = str(state.get("url", ""))
-                if config.target_hint and config.target_hint.lower() not in url.lower():
-                    continue
-                if not _request_matches_filters(
-                    url=url,
-                    method=str(state.get("method", "GET")),
-                    resource_type=(
-                        str(state["resource_type"]) if state.get("resource_type") is not None else None
-                    ),
-                    host_contains=config.filter_host_contains,
-                    path_contains=config.filter_path_contains,
-                    filter_method=config.filter_method,
-                    filter_resource_type=config.filter_resource_type,
-                ):
-                    continue
 
-                post_data = None
-                if config.capture_post_data:
-                    post_data = (
-                        str(state["post_data"])
-                        if state.get("post_data") is not None
-                        else None
-                    )
-                    if post_data is None:
-                        try:
-                            result = client.send_command(
-                                "Network.getRequestPostData",
-                                {"requestId": request_id},
-                            )
-                            post_data = _normalize_post_data(
-                                result.get("postData"),
-                                max(0, int(config.max_post_data_bytes)),
-                            )
-                        except Exception:  # noqa: BLE001
-                            post_data = None
-
-                capture = CapturedRequest(
-                    request_id=request_id,
-                    method=str(state.get("method", "GET")),
-                    url=url,
-                    headers=filtered,
-                    resource_type=(
-                        str(state["resource_type"])
-                        if state.get("resource_type") is not None
-                        else None
-                    ),
-                    post_data=post_data,
+                if method == _REQUEST_WILL_BE_SENT:
+                    request = params.get("request") or _EMPTY
+                    url = request.get("url", "")
+                    # URLs are mostly lower case already, so try the raw URL
+                    # before paying for a lowered copy.
+                    if hint_lower and hint_lower not in url and hint_lower not in url.lower():
+                        continue
+                    req_method = request.get("method", "GET")
+                    req_resource_type = params.get("type")
+                    if not matches_filters(url, req_method, req_resource_type):
+                        continue
+
+                    state = request_state.get(request_id)
+                    if state is None:
+                        state = request_state[request_id] = _ReqState(request_id)
+                    state.method = req_method
+                    state.url = url
+                    state.matched = True
+                    state.resource_type = req_resource_type
+                    if capture_post_data:
+                        state.post_data = _normalize_post_data(request.get("postData"), max_post_bytes)
+                    state.headers.update(_normalize_headers(request.get("headers") or _EMPTY))
+
+                else:  # Network.requestWillBeSentExtraInfo
+                    state = request_state.get(request_id)
+                    if state is None:
+                        state = request_state[request_id] = _ReqState(request_id)
+                    state.headers.update(_normalize_headers(params.get("headers") or _EMPTY))
+
+                if state.headers:
+                    dirty[request_id] = None
+
+            for request_id in dirty:
+                if len(captured) >= config.max_records:
+                    break
+                capture = _build_capture(
+                    request_state[request_id], allowed, hint_lower is not None, matches_filters, config, client
                 )
+                if capture is None:
+                    continue
                 captured.append(capture)
                 emitted_request_ids.add(request_id)
-
+                # Nothing reads an emitted request's state again.
+                del request_state[request_id]
+
+            if len(captured) - flushed >= _FLUSH_EVERY_RECORDS or (
+                len(captured) > flushed and time.time() - last_flush >= _FLUSH_INTERVAL_SECONDS
+            ):
+                append_captures(config.output_file, captured[flushed:], encryption_key=config.encryption_key)
+                flushed = len(captured)
+                last_flush = time.time()
+
+        reusable = pool is not None
+    except BaseException:
+        # Keep captures taken before the failure, but a failing flush (disk
+        # full, bad key) must not replace the original error.
+        if len(captured) > flushed:
+            with suppress(Exception):
+                append_captures(config.output_file, captured[flushed:], encryption_key=config.encryption_key)
+        raise
     finally:
-        client.close()
-
-    if captured:
-        append_captures(config.output_file, captured, encryption_key=config.encryption_key)
+        if reusable:
+            pool.release(client)
+        else:
+            client.close()
+    if len(captured) > flushed:
+        append_captures(config.output_file, captured[flushed:], encryption_key=config.encryption_key)
     return captured
@@ -1,27 +1,52 @@
 from __future__ import annotations
 
-import json
+import select
+import time
+from collections import deque
+from collections.abc import Iterable
 from itertools import count
 from typing import Any
 
 from websocket import (
+    ABNF,
     WebSocket,
     WebSocketBadStatusException,
     WebSocketTimeoutException,
     create_connection,
 )
 
+from .json_utils import dumps as json_dumps
+from .json_utils import loads as json_loads
+
+_DATA_OPCODES = (ABNF.OPCODE_TEXT, ABNF.OPCODE_BINARY)
+
+# Chrome serializes events with "method" as the first key, so the name can be
+# read off the frame without decoding the (possibly large) params.
+_EVENT_PREFIX = b'{"method":"'
+_EVENT_PREFIX_LEN = len(_EVENT_PREFIX)
+# Returned in place of a frame skipped by read_events(methods=...).
+_SKIPPED: dict[str, Any] = {}
+
 
 class CDPClient:
+    # Upper bound on waiting for the browser's close frame in close().
+    CLOSE_TIMEOUT_SECONDS = 1.0
+
     def __init__(self, websocket_url: str, timeout_seconds: int = 10) -> None:
         self.websocket_url = websocket_url
         self.timeout_seconds = timeout_seconds
-        self._next_id = count(1)
+        self._next_id = count(1).__next__
         self._ws: WebSocket | None = None
+        self._recv_timeout: float | None = None
+        # Events that arrived while send_command() was waiting for its reply.
+        self._backlog: deque[dict[str, Any]] = deque()
+        # Replies by command id; None until the reply for that id is read.
+        self._replies: dict[int, dict[str, Any] | None] = {}
 
     def connect(self) -> None:
         try:
             self._ws = create_connection(self.websocket_url, timeout=self.timeout_seconds)
+            self._recv_timeout = self.timeout_seconds
         except WebSocketBadStatusException as exc:
             raise RuntimeError(
                 "Failed to connect to Chrome DevTools websocket. "
@@ -30,38 +55,157 @@ class CDPClient:
 
     def close(self) -> None:
         if self._ws is not None:
-            self._ws.close()
-            self._ws = None
+            ws, self._ws = self._ws, None
+            ws.close(timeout=self.CLOSE_TIMEOUT_SECONDS)
 
     def send_command(self, method: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
         if self._ws is None:
             raise RuntimeError("CDP client is not connected")
 
-        msg_id = next(self._next_id)
+        msg_id = self._next_id()
         payload = {"id": msg_id, "method": method, "params": params or {}}
-        self._ws.send(json.dumps(payload))
-
-        while True:
-            raw = self._ws.recv()
-            message = json.loads(raw)
-            if message.get("id") == msg_id:
-                if "error" in message:
-                    raise RuntimeError(f"CDP command failed: {message['error']}")
-                return dict(message.get("result", {}))
-
-    def read_event(self, timeout_seconds: float = 1.0) -> dict[str, Any] | None:
+        self._replies[msg_id] = None
+        try:
+            # Bytes go out as a text frame without an extra str round trip.
+            self._ws.send(json_dumps(payload))
+            self._await_replies((msg_id,))
+            return self._result(self._replies[msg_id])
+        finally:
+            del self._replies[msg_id]
+
+    def send_commands(
+        self, commands: Iterable[tuple[str, dict[str, Any] | None]]
+    ) -> list[dict[str, Any]]:
+        """Send several commands back to back, then collect their results in order.
+
+        Chrome handles them in order either way; pipelining only saves the
+        per-command round trip. Raises on the first failed command.
+        """
         if self._ws is None:
             raise RuntimeError("CDP client is not connected")
-        self._ws.settimeout(timeout_seconds)
+
+        commands = list(commands)
+        ids = [self._next_id() for _ in commands]
+        for msg_id in ids:
+            self._replies[msg_id] = None
+        try:
+            for msg_id, (method, params) in zip(ids, commands, strict=True):
+                self._ws.send(json_dumps({"id": msg_id, "method": method, "params": params or {}}))
+            self._await_replies(ids)
+            return [self._result(self._replies[msg_id]) for msg_id in ids]
+        finally:
+            for msg_id in ids:
+                del self._replies[msg_id]
+
+    def _await_replies(self, ids: Iterable[int]) -> None:
+        """Read frames until every id in *ids* has its reply in ``self._replies``."""
+        ws = self._ws
+        # read_events() may have left a short poll timeout on the socket; a
+        # command reply gets the full connection timeout.
+        if self._recv_timeout != self.timeout_seconds:
+            ws.settimeout(self.timeout_seconds)
+            self._recv_timeout = self.timeout_seconds
+        replies = self._replies
+        for msg_id in ids:
+            while replies[msg_id] is None:
+                _, raw = ws.recv_data()
+                message = json_loads(raw)
+                if "method" in message:
+                    # Keep events for the next read_event(s) call instead of dropping them.
+                    self._backlog.append(message)
+                elif message.get("id") in replies:
+                    replies[message["id"]] = message
+                # Anything else is a late reply to a command that already failed.
+
+    @staticmethod
+    def _result(message: Any) -> dict[str, Any]:
+        if "error" in message:
+            raise RuntimeError(f"CDP command failed: {message['error']}")
+        return dict(message.get("result", {}))
+
+    def clear_events(self) -> None:
+        """Forget events held back while waiting for command replies."""
+        self._backlog.clear()
+
+    def _recv_message(
+        self, ws: WebSocket, timeout_seconds: float, methods: frozenset[bytes] | None = None
+    ) -> dict[str, Any] | None:
+        # settimeout() reconfigures the socket each call; capture loops always
+        # pass the same timeout, so only apply changes.
+        if timeout_seconds != self._recv_timeout:
+            ws.settimeout(timeout_seconds)
+            self._recv_timeout = timeout_seconds
         try:
-            raw = self._ws.recv()
+            # recv_data() hands back the frame bytes; recv() would decode them to str first.
+            opcode, raw = ws.recv_data()
         except WebSocketTimeoutException:
             return None
-        message = json.loads(raw)
-        if "method" not in message:
+        if opcode not in _DATA_OPCODES:
+            return None
+        if methods is not None and raw.startswith(_EVENT_PREFIX):
+            end = raw.find(b'"', _EVENT_PREFIX_LEN)
+            if end != -1 and raw[_EVENT_PREFIX_LEN:end] not in methods:
+                return _SKIPPED
+        return json_loads(raw)
+
+    @staticmethod
+    def _has_buffered_frame(ws: WebSocket) -> bool:
+        """True if another frame can be read without waiting on the network."""
+        sock = ws.sock
+        if sock is None:
+            return False
+        pending = getattr(sock, "pending", None)  # TLS may hold decrypted bytes
+        if pending is not None and pending():
+            return True
+        readable, _, _ = select.select([sock], [], [], 0)
+        return bool(readable)
+
+    def read_event(self, timeout_seconds: float = 1.0) -> dict[str, Any] | None:
+        if self._ws is None:
+            raise RuntimeError("CDP client is not connected")
+        if self._backlog:
+            return self._backlog.popleft()
+        message = self._recv_message(self._ws, timeout_seconds)
+        if message is None or "method" not in message:
             return None
         return message
 
+    def read_events(
+        self,
+        timeout_seconds: float = 1.0,
+        max_events: int = 256,
+        methods: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Wait up to *timeout_seconds* for an event, then drain frames already received.
+
+        Returns at most *max_events* events (messages with a ``method``); an
+        empty list means no wanted event arrived before the timeout. With
+        *methods*, other events are dropped, mostly without being decoded.
+        """
+        if self._ws is None:
+            raise RuntimeError("CDP client is not connected")
+        names = None if methods is None else frozenset(methods)
+        wanted = None if names is None else frozenset(m.encode() for m in names)
+        events: list[dict[str, Any]] = []
+        backlog = self._backlog
+        while backlog and len(events) < max_events:
+            event = backlog.popleft()
+            if names is None or event["method"] in names:
+                events.append(event)
+        if events and (len(events) >= max_events or not self._has_buffered_frame(self._ws)):
+            return events
+        message = self._recv_message(self._ws, timeout_seconds, wanted)
+        while message is not None:
+            method = message.get("method")
+            if method is not None and (names is None or method in names):
+                events.append(message)
+                if len(events) >= max_events:
+                    break
+            if not self._has_buffered_frame(self._ws):
+                break
+            message = self._recv_message(self._ws, timeout_seconds, wanted)
+        return events
+
     # ---- Page helpers ----
 
     def navigate(self, url: str) -> dict[str, Any]:
@@ -74,12 +218,9 @@ class CDPClient:
 
     def wait_for_load(self, timeout_seconds: float = 30.0) -> bool:
         """Block until a ``Page.loadEventFired`` event arrives or *timeout_seconds* elapses."""
-        import time
-
-        deadline = time.time() + timeout_seconds
-        while time.time() < deadline:
-            remaining = max(0.1, deadline - time.time())
-            event = self.read_event(timeout_seconds=min(remaining, 1.0))
+        deadline = time.monotonic() + timeout_seconds
+        while (remaining := deadline - time.monotonic()) > 0:
+            event = self.read_event(timeout_seconds=remaining)
             if event and event.get("method") == "Page.loadEventFired":
                 return True
         return False
@@ -1,14 +1,49 @@
 from __future__ import annotations
 
-import json
+import http.client
+import threading
 import time
 import urllib.parse
-import urllib.request
+from typing import Any
 
+from .json_utils import loads as json_loads
 
-def _read_json(url: str) -> list[dict] | dict:
-    with urllib.request.urlopen(url, timeout=5) as response:
-        return json.loads(response.read().decode("utf-8"))
+# Idle keep-alive connection per DevTools endpoint, reused by the discovery
+# calls (and their retries) instead of a new TCP connection per request. A
+# caller takes the connection out while using it, so the lock is only held
+# for the dict operations, never across a request.
+_connections: dict[tuple[str, int], http.client.HTTPConnection] = {}
+_connections_lock = threading.Lock()
+
+
+def _read_json(host: str, port: int, path: str = "/json") -> Any:
+    key = (host, port)
+    for attempt in range(2):
+        with _connections_lock:
+            conn = _connections.pop(key, None)
+        reused = conn is not None
+        if conn is None:
+            conn = http.client.HTTPConnection(host, port, timeout=5)
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            body = response.read()
+            break
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            # The browser may have dropped an idle keep-alive socket; retry
+            # once on a fresh connection before reporting the failure.
+            if not reused or attempt:
+                raise
+    with _connections_lock:
+        idle = _connections.setdefault(key, conn)
+    if idle is not conn:
+        # Another caller already parked a connection for this endpoint.
+        conn.close()
+    if response.status != 200:
+        raise RuntimeError(f"Chrome DevTools returned HTTP {response.status} for {path}")
+    # Parse the body bytes directly; json_loads uses orjson when installed.
+    return json_loads(body)
 
 
 def list_targets(host: str, port: int, retries: int = 1, retry_delay_seconds: float = 0.5) -> list[dict]:
@@ -16,7 +51,7 @@ def list_targets(host: str, port: int, retries: int = 1, retry_delay_seconds: fl
     last_error: Exception | None = None
     for attempt in range(max(1, retries)):
         try:
-            data = _read_json(endpoint)
+            data = _read_json(host, port)
             if not isinstance(data, list):
                 raise RuntimeError("Unexpected /json response from Chrome DevTools endpoint")
             return data
@@ -45,9 +80,13 @@ def pick_target(host: str, port: int, hint: str | None = None) -> dict:
     if hint:
         lowered = hint.lower()
         for target in targets:
-            url = str(target.get("url", "")).lower()
-            title = str(target.get("title", "")).lower()
-            if lowered in url or lowered in title:
+            # Try the raw strings first; a lowered copy is only made on a miss,
+            # and the title is only looked at when the URL doesn't match.
+            url = str(target.get("url", ""))
+            if lowered in url or lowered in url.lower():
+                return target
+            title = str(target.get("title", ""))
+            if lowered in title or lowered in title.lower():
                 return target
 
     return targets[0]
@@ -3,11 +3,41 @@ from __future__ import annotations
 import ctypes
 import os
 import platform
+import socket
 import subprocess
 import tempfile
 import time
 import urllib.request
 
+# Linux process table; is_browser_process_running reads it instead of running pgrep.
+_PROC_ROOT = "/proc"
+
+
+_DARWIN_APP_PATHS = {
+    "chrome": ("/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",),
+    "edge": ("/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge",),
+}
+# Expanded once at import; %ProgramFiles% and friends don't change while we run.
+_WINDOWS_CANDIDATES = {
+    browser: tuple(os.path.expandvars(p) for p in paths)
+    for browser, paths in {
+        "chrome": (
+            r"%ProgramFiles%\\Google\\Chrome\\Application\\chrome.exe",
+            r"%ProgramFiles(x86)%\\Google\\Chrome\\Application\\chrome.exe",
+            r"%LocalAppData%\\Google\\Chrome\\Application\\chrome.exe",
+        ),
+        "edge": (
+            r"%ProgramFiles%\\Microsoft\\Edge\\Application\\msedge.exe",
+            r"%ProgramFiles(x86)%\\Microsoft\\Edge\\Application\\msedge.exe",
+            r"%LocalAppData%\\Microsoft\\Edge\\Application\\msedge.exe",
+        ),
+    }.items()
+}
+
+# (browser, system) -> installed path. Only hits are kept, so a browser
+# installed while a long-lived process (the API server) runs is still found.
+_detected_paths: dict[tuple[str, str], str] = {}
+
 
 def detect_browser_path(browser: str) -> str | None:
     browser = browser.lower()
@@ -15,41 +45,37 @@ def detect_browser_path(browser: str) -> str | None:
         raise ValueError(f"Unsupported browser: {browser}")
 
     system = platform.system().lower()
+    key = (browser, system)
+    path = _detected_paths.get(key)
+    if path is not None:
+        return path
     if "darwin" in system:
-        app_paths = {
-            "chrome": "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-            "edge": "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge",
-        }
-        path = app_paths[browser]
-        return path if os.path.exists(path) else None
-    if "windows" in system:
-        candidates = {
-            "chrome": [
-                os.path.expandvars(r"%ProgramFiles%\\Google\\Chrome\\Application\\chrome.exe"),
-                os.path.expandvars(r"%ProgramFiles(x86)%\\Google\\Chrome\\Application\\chrome.exe"),
-                os.path.expandvars(r"%LocalAppData%\\Google\\Chrome\\Application\\chrome.exe"),
-            ],
-            "edge": [
-                os.path.expandvars(r"%ProgramFiles%\\Microsoft\\Edge\\Application\\msedge.exe"),
-                os.path.expandvars(r"%ProgramFiles(x86)%\\Microsoft\\Edge\\Application\\msedge.exe"),
-                os.path.expandvars(r"%LocalAppData%\\Microsoft\\Edge\\Application\\msedge.exe"),
-            ],
-        }[browser]
-        for candidate in candidates:
-            if os.path.exists(candidate):
-                return candidate
-    return None
+        candidates = _DARWIN_APP_PATHS[browser]
+    elif "windows" in system:
+        candidates = _WINDOWS_CANDIDATES[browser]
+    else:
+        return None
+    # os.access returns a bool straight from access(2); os.path.exists goes
+    # through stat() and an exception on every miss.
+    path = next((c for c in candidates if os.access(c, os.F_OK)), None)
+    if path is not None:
+        _detected_paths[key] = path
+    return path
 
 
 def wait_for_debug_endpoint(host: str, port: int, timeout_seconds: int = 15) -> None:
-    deadline = time.time() + timeout_seconds
+    deadline = time.monotonic() + timeout_seconds
     url = f"http://{host}:{port}/json/version"
-    while time.time() < deadline:
+    while time.monotonic() < deadline:
         try:
+            # A bare TCP connect is a cheap "is it listening yet?" probe; the
+            # HTTP request only runs once the port accepts connections.
+            with socket.create_connection((host, port), timeout=0.2):
+                pass
             with urllib.request.urlopen(url, timeout=1):
                 return
         except Exception:  # noqa: BLE001
-            time.sleep(0.5)
+            time.sleep(0.1)
     raise RuntimeError(f"Chrome DevTools endpoint did not come up at {url}")
 
 
@@ -63,10 +89,28 @@ def browser_is_reachable(host: str, port: int) -> bool:
         return False
 
 
+def _proc_cmdline_matches(needle: str, proc_root: str) -> bool:
+    """Scan ``/proc/*/cmdline`` for *needle*, case-insensitively (like ``pgrep -if``)."""
+    own_pid = str(os.getpid())
+    needle_bytes = needle.lower().encode()
+    for pid in os.listdir(proc_root):
+        if not pid.isdigit() or pid == own_pid:
+            continue
+        try:
+            with open(os.path.join(proc_root, pid, "cmdline"), "rb") as fh:
+                cmdline = fh.read()
+        except OSError:  # process exited or is not ours to read
+            continue
+        if needle_bytes in cmdline.replace(b"\0", b" ").lower():
+            return True
+    return False
+
+
 def is_browser_process_running(browser: str) -> bool:
     """Return ``True`` if any process matching *browser* is running.
 
-    On Windows this checks ``tasklist``; on POSIX it uses ``pgrep``.
+    On Windows this checks ``tasklist``; on Linux it reads ``/proc`` directly;
+    on other POSIX systems it uses ``pgrep``.
     """
     name_map = {"chrome": "chrome", "edge": "msedge"}
     needle = name_map.get(browser.lower(), browser.lower())
@@ -81,18 +125,39 @@ def is_browser_process_running(browser: str) -> bool:
                 timeout=5,
             )
             return needle.lower() in result.stdout.lower()
-        else:
-            result = subprocess.run(
-                ["pgrep", "-if", needle],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            return result.returncode == 0
+        if os.path.isdir(_PROC_ROOT):
+            # No fork/exec of pgrep; same full-command-line match.
+            return _proc_cmdline_matches(needle, _PROC_ROOT)
+        result = subprocess.run(
+            ["pgrep", "-if", needle],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        return result.returncode == 0
     except Exception:  # noqa: BLE001
         return False
 
 
+# Resolved 8.3 short paths. The browser and profile paths repeat on every
+# launch; failures aren't kept because a profile dir may not exist yet.
+_short_paths: dict[str, str] = {}
+
+
+def _short_path(p: str) -> str:
+    if " " not in p:
+        return p
+    short = _short_paths.get(p)
+    if short is not None:
+        return short
+    buf = ctypes.create_unicode_buffer(260)
+    n = ctypes.windll.kernel32.GetShortPathNameW(p, buf, 260)
+    if not n:
+        return p  # fall back to original on error
+    _short_paths[p] = buf.value
+    return buf.value
+
+
 def launch_browser(
     browser: str,
     browser_path: str | None,
@@ -111,48 +176,32 @@ def launch_browser(
         )
 
     profile_root = user_data_dir or tempfile.mkdtemp(prefix="cookie-monster-profile-")
+
+    # On Windows, Chrome needs special handling for two reasons:
+    # 1. Paths with spaces (e.g. "User Data") must use the Windows 8.3
+    #    short path to avoid Chrome's CLI parser splitting the argument.
+    # 2. Chrome must be launched in its own console (CREATE_NEW_CONSOLE)
+    #    so the debug port binds reliably when spawned from Python.
+    windows = platform.system().lower() == "windows"
+    # Only the path-bearing values can contain spaces; fixed flags are left alone.
+    path = _short_path if windows else str
+
     args: list[str] = [
-        resolved,
+        path(resolved),
         f"--remote-debugging-port={port}",
         "--remote-allow-origins=*",
-        f"--user-data-dir={profile_root}",
+        f"--user-data-dir={path(profile_root)}",
     ]
 
     if profile_directory:
-        args.append(f"--profile-directory={profile_directory}")
+        args.append(f"--profile-directory={path(profile_directory)}")
     if headless:
         args.append("--headless=new")
     if open_url:
-        args.extend(["--new-window", open_url])
-
-    # On Windows, Chrome needs special handling for two reasons:
-    # 1. Paths with spaces (e.g. "User Data") must use the Windows 8.3
-    #    short path to avoid Chrome's CLI parser splitting the argument.
-    # 2. Chrome must be launched in its own console (CREATE_NEW_CONSOLE)
-    #    so the debug port binds reliably when spawned from Python.
-    if platform.system().lower() == "windows":
-        if "--enable-logging" not in args:
-            args.append("--enable-logging")
-
-        # Convert any path with spaces to the Windows 8.3 short form so
-        # Chrome's command-line parser never sees embedded spaces.
-        def _short_path(p: str) -> str:
-            if " " not in p:
-                return p
-            buf = ctypes.create_unicode_buffer(260)
-            n = ctypes.windll.kernel32.GetShortPathNameW(p, buf, 260)
-            return buf.value if n else p  # fall back to original on error
-
-        def _fix_arg(a: str) -> str:
-            if "=" in a:
-                flag, _, value = a.partition("=")
-                return f"{flag}={_short_path(value)}"
-            if " " in a and not a.startswith("-"):
-                return _short_path(a)
-            return a
-
-        args = [_fix_arg(a) for a in args]
+        args.extend(["--new-window", path(open_url)])
 
+    if windows:
+        args.append("--enable-logging")
         creationflags = int(getattr(subprocess, "CREATE_NEW_CONSOLE", 0))
         return subprocess.Popen(
             args,
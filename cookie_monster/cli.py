@@ -1,29 +1,33 @@
 from __future__ import annotations
 
 import argparse
-import json
-import webbrowser
+import sys
+from collections.abc import Callable
+from functools import cache
 from importlib.metadata import PackageNotFoundError, version
-from subprocess import Popen
-
-from .api_server import serve_api
-from .browser_profiles import default_user_data_dir, list_profiles
-from .capture import capture_requests
-from .chrome_discovery import list_page_targets
-from .chrome_launcher import launch_browser, wait_for_debug_endpoint
-from .config import CaptureConfig, ReplayConfig
-from .crypto import resolve_key
-from .diffing import compare_capture_files
-from .doctor import run_doctor
-from .plugins import auto_detect_adapter, get_adapter, list_adapters
-from .recipes import Recipe, list_recipes, load_recipe, save_recipe
-from .replay import replay_with_capture
-from .security_utils import redact_headers
-from .session_health import analyze_session_health
-from .storage import load_captures
-from .tab_manager import TabManager, TabManagerConfig
+from typing import TYPE_CHECKING
 
+from .config import DEFAULT_HEADER_ALLOWLIST, CaptureConfig, ReplayConfig
+from .json_utils import dumps as json_dumps
 
+if TYPE_CHECKING:
+    from subprocess import Popen
+
+# Everything else is imported by the command that needs it, so a run only
+# loads its own dependencies (requests, cryptography, websocket, ...).
+
+
+def _adapter_choice(value: str) -> str:
+    """``--adapter`` type: validated against the registry only when the flag is given."""
+    from .plugins import list_adapters
+
+    names = list_adapters()
+    if value not in names:
+        raise argparse.ArgumentTypeError(f"invalid choice: {value!r} (choose from {', '.join(names)})")
+    return value
+
+
+@cache
 def _tool_version() -> str:
     try:
         return version("cookie-monster-cli")
@@ -31,26 +35,41 @@ def _tool_version() -> str:
         return "0.0.0"
 
 
+class _VersionAction(argparse.Action):
+    """``--version`` that looks up the installed version only when it is used."""
+
+    def __init__(self, option_strings: list[str], dest: str = argparse.SUPPRESS, help: str | None = None) -> None:
+        super().__init__(
+            option_strings,
+            dest=dest,
+            default=argparse.SUPPRESS,
+            nargs=0,
+            help=help or "show program's version number and exit",
+        )
+
+    def __call__(self, parser, namespace, values, option_string=None) -> None:
+        print(f"{parser.prog} {_tool_version()}")
+        parser.exit()
+
+
 def _emit(payload: dict, output_format: str) -> None:
+    # Output is ASCII-escaped (as stdlib json does), so it prints on any
+    # console encoding and doesn't depend on whether orjson is installed.
     if output_format == "ndjson":
-        print(json.dumps(payload, separators=(",", ":")))
+        # Write the serialized bytes straight to the binary layer instead of
+        # decoding them for print() to re-encode.
+        out = sys.stdout
+        buffer = getattr(out, "buffer", None)
+        if buffer is None:
+            print(json_dumps(payload, ascii=True).decode("ascii"))
+            return
+        out.flush()
+        buffer.write(json_dumps(payload, ascii=True) + b"\n")
         return
-    print(json.dumps(payload, indent=2))
+    print(json_dumps(payload, indent=True, ascii=True).decode("ascii"))
 
 
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(
-        prog="cookie-monster",
-        description=(
-            "Capture auth headers from your own browser DevTools network traffic "
-            "and replay requests for automation."
-        ),
-    )
-    parser.add_argument("--version", action="version", version=f"%(prog)s {_tool_version()}")
-    parser.add_argument("--format", choices=["json", "ndjson"], default="json")
-    subparsers = parser.add_subparsers(dest="command", required=True)
-
-    capture_parser = subparsers.add_parser("capture", help="Capture request headers from browser")
+def _configure_capture(capture_parser: argparse.ArgumentParser) -> None:
     capture_parser.add_argument("--chrome-host", default="127.0.0.1")
     capture_parser.add_argument("--chrome-port", type=int, default=9222)
     capture_parser.add_argument(
@@ -70,7 +89,7 @@ def build_parser() -> argparse.ArgumentParser:
         help="Repeatable header name allowlist (default captures cookie/auth headers)",
     )
     capture_parser.add_argument("--include-all-headers", action="store_true")
-    capture_parser.add_argument("--adapter", default=None, choices=list_adapters())
+    capture_parser.add_argument("--adapter", default=None, type=_adapter_choice)
     capture_parser.add_argument("--auto-adapter", action="store_true")
     capture_parser.add_argument("--filter-host", default=None)
     capture_parser.add_argument("--filter-path", default=None)
@@ -94,7 +113,8 @@ def build_parser() -> argparse.ArgumentParser:
     capture_parser.add_argument("--encryption-key", default=None)
     capture_parser.add_argument("--encryption-key-env", default="COOKIE_MONSTER_ENCRYPTION_KEY")
 
-    replay_parser = subparsers.add_parser("replay", help="Replay HTTP request from captured headers")
+
+def _configure_replay(replay_parser: argparse.ArgumentParser) -> None:
     replay_parser.add_argument("--capture-file", default="captures.jsonl")
     replay_parser.add_argument("--request-url", required=True)
     replay_parser.add_argument("--method", default="GET")
@@ -107,75 +127,86 @@ def build_parser() -> argparse.ArgumentParser:
     replay_parser.add_argument("--retry-attempts", type=int, default=1)
     replay_parser.add_argument("--retry-backoff", type=float, default=0.5)
     replay_parser.add_argument("--allowed-domain", action="append", default=None)
-    replay_parser.add_argument("--adapter", default=None, choices=list_adapters())
+    replay_parser.add_argument("--adapter", default=None, type=_adapter_choice)
     replay_parser.add_argument("--auto-adapter", action="store_true")
     replay_parser.add_argument("--redact-output", action="store_true")
     replay_parser.add_argument("--no-enforce-capture-host", action="store_true")
     replay_parser.add_argument("--encryption-key", default=None)
     replay_parser.add_argument("--encryption-key-env", default="COOKIE_MONSTER_ENCRYPTION_KEY")
 
-    targets_parser = subparsers.add_parser("list-targets", help="List browser page targets from DevTools")
+
+def _configure_list_targets(targets_parser: argparse.ArgumentParser) -> None:
     targets_parser.add_argument("--chrome-host", default="127.0.0.1")
     targets_parser.add_argument("--chrome-port", type=int, default=9222)
 
-    profiles_parser = subparsers.add_parser("profile-list", help="List local browser profiles")
+
+def _configure_profile_list(profiles_parser: argparse.ArgumentParser) -> None:
     profiles_parser.add_argument("--browser", default="chrome", choices=["chrome", "edge"])
     profiles_parser.add_argument("--user-data-dir", default=None)
 
-    doctor_parser = subparsers.add_parser("doctor", help="Run connectivity and environment checks")
+
+def _configure_doctor(doctor_parser: argparse.ArgumentParser) -> None:
     doctor_parser.add_argument("--browser", default="chrome", choices=["chrome", "edge"])
     doctor_parser.add_argument("--chrome-host", default="127.0.0.1")
     doctor_parser.add_argument("--chrome-port", type=int, default=9222)
     doctor_parser.add_argument("--user-data-dir", default=None)
 
-    serve_parser = subparsers.add_parser("serve", help="Run local HTTP API mode")
+
+def _configure_serve(serve_parser: argparse.ArgumentParser) -> None:
     serve_parser.add_argument("--host", default="127.0.0.1")
     serve_parser.add_argument("--port", type=int, default=8787)
     serve_parser.add_argument("--api-token", default=None)
     serve_parser.add_argument("--api-token-env", default="COOKIE_MONSTER_API_TOKEN")
 
-    ui_parser = subparsers.add_parser("ui", help="Run local UI for encrypted auth cache checks")
+
+def _configure_ui(ui_parser: argparse.ArgumentParser) -> None:
     ui_parser.add_argument("--host", default="127.0.0.1")
     ui_parser.add_argument("--port", type=int, default=8787)
     ui_parser.add_argument("--api-token", default=None)
     ui_parser.add_argument("--api-token-env", default="COOKIE_MONSTER_API_TOKEN")
     ui_parser.add_argument("--no-open", action="store_true")
 
-    adapters_parser = subparsers.add_parser("adapter-list", help="List built-in site adapters")
+
+def _configure_adapter_list(adapters_parser: argparse.ArgumentParser) -> None:
     adapters_parser.add_argument("--verbose", action="store_true")
 
-    health_parser = subparsers.add_parser("session-health", help="Analyze token/session health from capture file")
+
+def _configure_session_health(health_parser: argparse.ArgumentParser) -> None:
     health_parser.add_argument("--capture-file", required=True)
     health_parser.add_argument("--encryption-key", default=None)
     health_parser.add_argument("--encryption-key-env", default="COOKIE_MONSTER_ENCRYPTION_KEY")
 
-    diff_parser = subparsers.add_parser("diff-captures", help="Compare two capture files for header/method changes")
+
+def _configure_diff_captures(diff_parser: argparse.ArgumentParser) -> None:
     diff_parser.add_argument("--a", required=True, help="First capture file")
     diff_parser.add_argument("--b", required=True, help="Second capture file")
     diff_parser.add_argument("--a-key", default=None)
     diff_parser.add_argument("--b-key", default=None)
 
-    recipe_save_parser = subparsers.add_parser("recipe-save", help="Save a named recipe from CLI options")
+
+def _configure_recipe_save(recipe_save_parser: argparse.ArgumentParser) -> None:
     recipe_save_parser.add_argument("--name", required=True)
     recipe_save_parser.add_argument("--capture-file", default="captures.jsonl")
     recipe_save_parser.add_argument("--request-url", required=True)
     recipe_save_parser.add_argument("--target-hint", default=None)
     recipe_save_parser.add_argument("--url-contains", default=None)
     recipe_save_parser.add_argument("--method", default="GET")
-    recipe_save_parser.add_argument("--adapter", default=None, choices=list_adapters())
+    recipe_save_parser.add_argument("--adapter", default=None, type=_adapter_choice)
     recipe_save_parser.add_argument("--base-dir", default=None)
 
-    recipe_run_parser = subparsers.add_parser("recipe-run", help="Run capture+replay from named recipe")
+
+def _configure_recipe_run(recipe_run_parser: argparse.ArgumentParser) -> None:
     recipe_run_parser.add_argument("--name", required=True)
     recipe_run_parser.add_argument("--base-dir", default=None)
     recipe_run_parser.add_argument("--duration", type=int, default=None)
     recipe_run_parser.add_argument("--max-records", type=int, default=None)
 
-    recipe_list_parser = subparsers.add_parser("recipe-list", help="List saved recipes")
+
+def _configure_recipe_list(recipe_list_parser: argparse.ArgumentParser) -> None:
     recipe_list_parser.add_argument("--base-dir", default=None)
 
-    # ---- tab management commands ----
-    refresh_parser = subparsers.add_parser("refresh-tab", help="Refresh an existing browser tab without closing it")
+
+def _configure_refresh_tab(refresh_parser: argparse.ArgumentParser) -> None:
     refresh_parser.add_argument("--chrome-host", default="127.0.0.1")
     refresh_parser.add_argument("--chrome-port", type=int, default=9222)
     refresh_parser.add_argument("--target-id", default=None, help="Target ID of the tab to refresh (default: first tab)")
@@ -183,7 +214,8 @@ def build_parser() -> argparse.ArgumentParser:
     refresh_parser.add_argument("--ignore-cache", action="store_true")
     refresh_parser.add_argument("--timeout", type=float, default=30.0)
 
-    navigate_parser = subparsers.add_parser("navigate-tab", help="Navigate an existing tab to a new URL")
+
+def _configure_navigate_tab(navigate_parser: argparse.ArgumentParser) -> None:
     navigate_parser.add_argument("url", help="URL to navigate to")
     navigate_parser.add_argument("--chrome-host", default="127.0.0.1")
     navigate_parser.add_argument("--chrome-port", type=int, default=9222)
@@ -191,344 +223,495 @@ def build_parser() -> argparse.ArgumentParser:
     navigate_parser.add_argument("--target-hint", default=None)
     navigate_parser.add_argument("--timeout", type=float, default=30.0)
 
-    open_tab_parser = subparsers.add_parser("open-tab", help="Open a new browser tab")
+
+def _configure_open_tab(open_tab_parser: argparse.ArgumentParser) -> None:
     open_tab_parser.add_argument("--url", default="about:blank")
     open_tab_parser.add_argument("--chrome-host", default="127.0.0.1")
     open_tab_parser.add_argument("--chrome-port", type=int, default=9222)
 
-    close_tab_parser = subparsers.add_parser("close-tab", help="Close a specific browser tab")
+
+def _configure_close_tab(close_tab_parser: argparse.ArgumentParser) -> None:
     close_tab_parser.add_argument("--target-id", required=True)
     close_tab_parser.add_argument("--chrome-host", default="127.0.0.1")
     close_tab_parser.add_argument("--chrome-port", type=int, default=9222)
 
-    return parser
 
+_SUBCOMMANDS: dict[str, tuple[str, Callable[[argparse.ArgumentParser], None]]] = {
+    "capture": ("Capture request headers from browser", _configure_capture),
+    "replay": ("Replay HTTP request from captured headers", _configure_replay),
+    "list-targets": ("List browser page targets from DevTools", _configure_list_targets),
+    "profile-list": ("List local browser profiles", _configure_profile_list),
+    "doctor": ("Run connectivity and environment checks", _configure_doctor),
+    "serve": ("Run local HTTP API mode", _configure_serve),
+    "ui": ("Run local UI for encrypted auth cache checks", _configure_ui),
+    "adapter-list": ("List built-in site adapters", _configure_adapter_list),
+    "session-health": ("Analyze token/session health from capture file", _configure_session_health),
+    "diff-captures": ("Compare two capture files for header/method changes", _configure_diff_captures),
+    "recipe-save": ("Save a named recipe from CLI options", _configure_recipe_save),
+    "recipe-run": ("Run capture+replay from named recipe", _configure_recipe_run),
+    "recipe-list": ("List saved recipes", _configure_recipe_list),
+    # tab management commands
+    "refresh-tab": ("Refresh an existing browser tab without closing it", _configure_refresh_tab),
+    "navigate-tab": ("Navigate an existing tab to a new URL", _configure_navigate_tab),
+    "open-tab": ("Open a new browser tab", _configure_open_tab),
+    "close-tab": ("Close a specific browser tab", _configure_close_tab),
+}
+
+
+def build_parser(command: str | None = None, *, subcommand_args: bool = True) -> argparse.ArgumentParser:
+    """Build the CLI parser.
+
+    Every subcommand is registered so the top-level help lists them all; with
+    *command*, only that subcommand's arguments are added, and with
+    ``subcommand_args=False`` none are.
+    """
+    parser = argparse.ArgumentParser(
+        prog="cookie-monster",
+        description=(
+            "Capture auth headers from your own browser DevTools network traffic "
+            "and replay requests for automation."
+        ),
+    )
+    parser.add_argument("--version", action=_VersionAction)
+    parser.add_argument("--format", choices=["json", "ndjson"], default="json")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (help_text, configure) in _SUBCOMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text)
+        if subcommand_args and (command is None or command == name):
+            configure(subparser)
+    return parser
 
-def main() -> None:
-    parser = build_parser()
-    args = parser.parse_args()
-    launched_proc: Popen[bytes] | None = None
-
-    if args.command == "capture":
-        adapter = None
-        if args.adapter:
-            adapter = get_adapter(args.adapter)
-        elif args.auto_adapter:
-            adapter = auto_detect_adapter(args.target_hint or args.open_url or "")
-        adapter_defaults = adapter.defaults() if adapter else None
-        encryption_key = resolve_key(args.encryption_key, args.encryption_key_env)
-
-        if args.launch_chrome or args.launch_browser:
-            launched_proc = launch_browser(
-                browser=args.browser,
-                browser_path=args.browser_path or args.chrome_path,
-                host=args.chrome_host,
-                port=args.chrome_port,
-                user_data_dir=args.user_data_dir,
-                profile_directory=args.profile_directory,
-                open_url=args.open_url,
-                headless=args.headless,
-            )
-            wait_for_debug_endpoint(args.chrome_host, args.chrome_port)
-
-        config = CaptureConfig(
-            chrome_host=args.chrome_host,
-            chrome_port=args.chrome_port,
-            duration_seconds=args.duration,
-            max_records=args.max_records,
-            target_hint=args.target_hint,
-            output_file=args.output,
-            header_allowlist=args.header or CaptureConfig().header_allowlist,
-            include_all_headers=args.include_all_headers,
-            filter_host_contains=args.filter_host,
-            filter_path_contains=args.filter_path,
-            filter_method=args.filter_method,
-            filter_resource_type=args.filter_resource_type,
-            capture_post_data=args.capture_post_data,
-            max_post_data_bytes=args.max_post_data_bytes,
-            encryption_key=encryption_key,
-            refresh_tab=args.refresh_tab,
-            refresh_target_id=args.refresh_target_id,
-            ignore_cache=args.ignore_cache,
-        )
-        if adapter_defaults:
-            if config.target_hint is None:
-                config.target_hint = adapter_defaults.target_hint
-            if config.filter_host_contains is None:
-                config.filter_host_contains = adapter_defaults.filter_host_contains
-            if config.filter_path_contains is None:
-                config.filter_path_contains = adapter_defaults.filter_path_contains
-        try:
-            captures = capture_requests(config)
-            sample = [c.to_dict() for c in captures[:3]]
-            if args.redact_output:
-                for item in sample:
-                    item["headers"] = redact_headers(dict(item.get("headers", {})))
-            _emit(
-                {
-                    "captured": len(captures),
-                    "output": config.output_file,
-                    "adapter": adapter.name if adapter else None,
-                    "encrypted": bool(encryption_key),
-                    "sample": sample,
-                },
-                args.format,
-            )
-        finally:
-            if launched_proc is not None and not args.keep_open:
-                launched_proc.terminate()
-        return
-
-    if args.command == "replay":
-        adapter = None
-        if args.adapter:
-            adapter = get_adapter(args.adapter)
-        elif args.auto_adapter:
-            adapter = auto_detect_adapter(args.request_url)
-        adapter_defaults = adapter.defaults() if adapter else None
-        allowed_domains = args.allowed_domain or []
-        if adapter_defaults:
-            for d in adapter_defaults.allowed_domains:
-                if d not in allowed_domains:
-                    allowed_domains.append(d)
-        url_contains = args.url_contains
-        if url_contains is None and adapter_defaults:
-            url_contains = adapter_defaults.replay_url_contains
-        encryption_key = resolve_key(args.encryption_key, args.encryption_key_env)
-
-        config = ReplayConfig(
-            capture_file=args.capture_file,
-            request_url=args.request_url,
-            method=args.method,
-            url_contains=url_contains,
-            timeout_seconds=args.timeout,
-            output_file=args.output,
-            body=args.data,
-            json_body_file=args.json_body_file,
-            use_captured_body=args.use_captured_body,
-            retry_attempts=args.retry_attempts,
-            retry_backoff_seconds=args.retry_backoff,
-            allowed_domains=allowed_domains,
-            redact_output=args.redact_output,
-            enforce_capture_host=not args.no_enforce_capture_host,
-            encryption_key=encryption_key,
-        )
-        response = replay_with_capture(config)
-        _emit(
-            {
-                    "status_code": response.status_code,
-                    "content_type": response.headers.get("Content-Type", ""),
-                    "adapter": adapter.name if adapter else None,
-                    "body_preview": response.text[:400],
-                },
-                args.format,
-            )
-        return
 
-    if args.command == "list-targets":
-        targets = list_page_targets(args.chrome_host, args.chrome_port)
-        mapped = [
-            {
-                "id": t.get("id"),
-                "title": t.get("title"),
-                "url": t.get("url"),
-                "type": t.get("type"),
-            }
-            for t in targets
-        ]
-        _emit({"targets": mapped, "count": len(mapped)}, args.format)
-        return
+def _command_from_argv(argv: list[str]) -> str | None:
+    """Return the subcommand named in *argv*, or ``None`` if there isn't a known one."""
+    args = iter(argv)
+    for arg in args:
+        if arg == "--format":
+            next(args, None)  # skip its value
+        elif not arg.startswith("-"):
+            return arg if arg in _SUBCOMMANDS else None
+    return None
 
-    if args.command == "profile-list":
-        user_data_dir = args.user_data_dir or default_user_data_dir(args.browser)
-        if not user_data_dir:
-            raise RuntimeError("Could not determine user data dir. Pass --user-data-dir")
-        profiles = list_profiles(user_data_dir)
-        _emit({"browser": args.browser, "user_data_dir": user_data_dir, "profiles": profiles}, args.format)
-        return
 
-    if args.command == "doctor":
-        report = run_doctor(args.browser, args.chrome_host, args.chrome_port, args.user_data_dir)
-        _emit(report, args.format)
-        return
+# main() can run many times per process (tests, wrappers); build each parser once.
+_get_parser = cache(build_parser)
 
-    if args.command == "serve":
-        api_token = resolve_key(args.api_token, args.api_token_env)
-        serve_api(args.host, args.port, api_token=api_token)
-        return
 
-    if args.command == "ui":
-        if not args.no_open:
-            webbrowser.open(f"http://{args.host}:{args.port}/ui")
-        api_token = resolve_key(args.api_token, args.api_token_env)
-        serve_api(args.host, args.port, api_token=api_token)
-        return
+def _cmd_capture(args: argparse.Namespace) -> None:
+    from .chrome_launcher import launch_browser, wait_for_debug_endpoint
+    from .crypto import resolve_key
+    from .plugins import auto_detect_adapter, get_adapter
+    from .security_utils import redact_headers
 
-    if args.command == "adapter-list":
-        names = list_adapters()
-        if not args.verbose:
-            _emit({"adapters": names}, args.format)
-            return
-        detailed = []
-        for name in names:
-            adapter = get_adapter(name)
-            defaults = adapter.defaults()
-            detailed.append(
-                {
-                    "name": name,
-                    "target_hint": defaults.target_hint,
-                    "filter_host_contains": defaults.filter_host_contains,
-                    "allowed_domains": defaults.allowed_domains,
-                }
-            )
-        _emit({"adapters": detailed}, args.format)
-        return
+    adapter = None
+    if args.adapter:
+        adapter = get_adapter(args.adapter)
+    elif args.auto_adapter:
+        adapter = auto_detect_adapter(args.target_hint or args.open_url or "")
+    adapter_defaults = adapter.defaults() if adapter else None
+    encryption_key = resolve_key(args.encryption_key, args.encryption_key_env)
 
-    if args.command == "session-health":
-        key = resolve_key(args.encryption_key, args.encryption_key_env)
-        captures = load_captures(args.capture_file, encryption_key=key)
-        health = analyze_session_health(captures)
-        _emit(
-            {
-                "has_cookie": health.has_cookie,
-                "bearer_token_count": health.bearer_token_count,
-                "jwt_expired": health.jwt_expired,
-                "jwt_expires_at": health.jwt_expires_at,
-            },
-            args.format,
+    launched_proc: Popen[bytes] | None = None
+    if args.launch_chrome or args.launch_browser:
+        launched_proc = launch_browser(
+            browser=args.browser,
+            browser_path=args.browser_path or args.chrome_path,
+            host=args.chrome_host,
+            port=args.chrome_port,
+            user_data_dir=args.user_data_dir,
+            profile_directory=args.profile_directory,
+            open_url=args.open_url,
+            headless=args.headless,
         )
-        return
+        wait_for_debug_endpoint(args.chrome_host, args.chrome_port)
+
+    config = CaptureConfig(
+        chrome_host=args.chrome_host,
+        chrome_port=args.chrome_port,
+        duration_seconds=args.duration,
+        max_records=args.max_records,
+        target_hint=args.target_hint,
+        output_file=args.output,
+        header_allowlist=args.header or list(DEFAULT_HEADER_ALLOWLIST),
+        include_all_headers=args.include_all_headers,
+        filter_host_contains=args.filter_host,
+        filter_path_contains=args.filter_path,
+        filter_method=args.filter_method,
+        filter_resource_type=args.filter_resource_type,
+        capture_post_data=args.capture_post_data,
+        max_post_data_bytes=args.max_post_data_bytes,
+        encryption_key=encryption_key,
+        refresh_tab=args.refresh_tab,
+        refresh_target_id=args.refresh_target_id,
+        ignore_cache=args.ignore_cache,
+    )
+    if adapter_defaults:
+        if config.target_hint is None:
+            config.target_hint = adapter_defaults.target_hint
+        if config.filter_host_contains is None:
+            config.filter_host_contains = adapter_defaults.filter_host_contains
+        if config.filter_path_contains is None:
+            config.filter_path_contains = adapter_defaults.filter_path_contains
+    # Imported here so other commands don't load the CDP/websocket stack.
+    from .capture import capture_requests
 
-    if args.command == "diff-captures":
-        diff = compare_capture_files(args.a, args.b, encryption_key_a=args.a_key, encryption_key_b=args.b_key)
+    try:
+        captures = capture_requests(config)
+        sample = []
+        for captured in captures[:3]:
+            item = captured.to_dict()
+            if args.redact_output:
+                # redact_headers copies only when something is masked, so
+                # the captured request's own headers are never mutated.
+                item["headers"] = redact_headers(item["headers"])
+            sample.append(item)
         _emit(
             {
-                "headers_added": diff.headers_added,
-                "headers_removed": diff.headers_removed,
-                "method_changed": diff.method_changed,
+                "captured": len(captures),
+                "output": config.output_file,
+                "adapter": adapter.name if adapter else None,
+                "encrypted": bool(encryption_key),
+                "sample": sample,
             },
             args.format,
         )
-        return
+    finally:
+        if launched_proc is not None and not args.keep_open:
+            launched_proc.terminate()
+
+
+def _cmd_replay(args: argparse.Namespace) -> None:
+    from .crypto import resolve_key
+    from .plugins import auto_detect_adapter, get_adapter
+
+    adapter = None
+    if args.adapter:
+        adapter = get_adapter(args.adapter)
+    elif args.auto_adapter:
+        adapter = auto_detect_adapter(args.request_url)
+    adapter_defaults = adapter.defaults() if adapter else None
+    allowed_domains = args.allowed_domain or []
+    if adapter_defaults:
+        # Ordered de-duplication: explicit domains first, then the adapter's.
+        allowed_domains = list(dict.fromkeys([*allowed_domains, *adapter_defaults.allowed_domains]))
+    url_contains = args.url_contains
+    if url_contains is None and adapter_defaults:
+        url_contains = adapter_defaults.replay_url_contains
+    encryption_key = resolve_key(args.encryption_key, args.encryption_key_env)
+
+    config = ReplayConfig(
+        capture_file=args.capture_file,
+        request_url=args.request_url,
+        method=args.method,
+        url_contains=url_contains,
+        timeout_seconds=args.timeout,
+        output_file=args.output,
+        body=args.data,
+        json_body_file=args.json_body_file,
+        use_captured_body=args.use_captured_body,
+        retry_attempts=args.retry_attempts,
+        retry_backoff_seconds=args.retry_backoff,
+        allowed_domains=allowed_domains,
+        redact_output=args.redact_output,
+        enforce_capture_host=not args.no_enforce_capture_host,
+        encryption_key=encryption_key,
+    )
+    from .replay import body_preview, replay_with_capture
+
+    response = replay_with_capture(config)
+    _emit(
+        {
+            "status_code": response.status_code,
+            "content_type": response.headers.get("Content-Type", ""),
+            "adapter": adapter.name if adapter else None,
+            "body_preview": body_preview(response),
+        },
+        args.format,
+    )
 
-    if args.command == "recipe-save":
-        adapter = get_adapter(args.adapter) if args.adapter else None
-        defaults = adapter.defaults() if adapter else None
-        cap = CaptureConfig(
-            target_hint=args.target_hint or (defaults.target_hint if defaults else None),
-            output_file=args.capture_file,
-            filter_host_contains=(defaults.filter_host_contains if defaults else None),
-        )
-        rep = ReplayConfig(
-            capture_file=args.capture_file,
-            request_url=args.request_url,
-            method=args.method,
-            url_contains=args.url_contains or (defaults.replay_url_contains if defaults else None),
-            allowed_domains=list(defaults.allowed_domains) if defaults else [],
-        )
-        path = save_recipe(Recipe(name=args.name, capture=cap, replay=rep), base_dir=args.base_dir)
-        _emit({"saved": str(path), "name": args.name}, args.format)
-        return
 
-    if args.command == "recipe-list":
-        _emit({"recipes": list_recipes(base_dir=args.base_dir)}, args.format)
-        return
+def _cmd_list_targets(args: argparse.Namespace) -> None:
+    from .chrome_discovery import list_page_targets
 
-    if args.command == "recipe-run":
-        recipe = load_recipe(args.name, base_dir=args.base_dir)
-        if args.duration is not None:
-            recipe.capture.duration_seconds = args.duration
-        if args.max_records is not None:
-            recipe.capture.max_records = args.max_records
-        captures = capture_requests(recipe.capture)
-        response = replay_with_capture(recipe.replay)
-        _emit(
+    targets = list_page_targets(args.chrome_host, args.chrome_port)
+    mapped = [
+        {
+            "id": t.get("id"),
+            "title": t.get("title"),
+            "url": t.get("url"),
+            "type": t.get("type"),
+        }
+        for t in targets
+    ]
+    _emit({"targets": mapped, "count": len(mapped)}, args.format)
+
+
+def _cmd_profile_list(args: argparse.Namespace) -> None:
+    from .browser_profiles import default_user_data_dir, list_profiles
+
+    user_data_dir = args.user_data_dir or default_user_data_dir(args.browser)
+    if not user_data_dir:
+        raise RuntimeError("Could not determine user data dir. Pass --user-data-dir")
+    profiles = list_profiles(user_data_dir)
+    _emit({"browser": args.browser, "user_data_dir": user_data_dir, "profiles": profiles}, args.format)
+
+
+def _cmd_doctor(args: argparse.Namespace) -> None:
+    from .doctor import run_doctor
+
+    report = run_doctor(args.browser, args.chrome_host, args.chrome_port, args.user_data_dir)
+    _emit(report, args.format)
+
+
+def _cmd_serve(args: argparse.Namespace) -> None:
+    from .api_server import serve_api
+    from .crypto import resolve_key
+
+    api_token = resolve_key(args.api_token, args.api_token_env)
+    serve_api(args.host, args.port, api_token=api_token)
+
+
+def _cmd_ui(args: argparse.Namespace) -> None:
+    import webbrowser
+
+    from .api_server import serve_api
+    from .crypto import resolve_key
+
+    if not args.no_open:
+        webbrowser.open(f"http://{args.host}:{args.port}/ui")
+    api_token = resolve_key(args.api_token, args.api_token_env)
+    serve_api(args.host, args.port, api_token=api_token)
+
+
+def _cmd_adapter_list(args: argparse.Namespace) -> None:
+    from .plugins import get_adapter, list_adapters
+
+    names = list_adapters()
+    if not args.verbose:
+        _emit({"adapters": names}, args.format)
+        return
+    detailed = []
+    for name in names:
+        adapter = get_adapter(name)
+        defaults = adapter.defaults()
+        detailed.append(
             {
-                "name": args.name,
-                "captured": len(captures),
-                "status_code": response.status_code,
-                "request_url": recipe.replay.request_url,
-            },
-            args.format,
+                "name": name,
+                "target_hint": defaults.target_hint,
+                "filter_host_contains": defaults.filter_host_contains,
+                "allowed_domains": defaults.allowed_domains,
+            }
         )
-        return
+    _emit({"adapters": detailed}, args.format)
+
+
+def _cmd_session_health(args: argparse.Namespace) -> None:
+    from .crypto import resolve_key
+    from .session_health import analyze_session_health
+    from .storage import load_captures
+
+    key = resolve_key(args.encryption_key, args.encryption_key_env)
+    captures = load_captures(args.capture_file, encryption_key=key)
+    health = analyze_session_health(captures)
+    _emit(
+        {
+            "has_cookie": health.has_cookie,
+            "bearer_token_count": health.bearer_token_count,
+            "jwt_expired": health.jwt_expired,
+            "jwt_expires_at": health.jwt_expires_at,
+        },
+        args.format,
+    )
 
-    if args.command == "refresh-tab":
-        mgr_config = TabManagerConfig(
-            chrome_host=args.chrome_host,
-            chrome_port=args.chrome_port,
-            load_timeout_seconds=args.timeout,
-            ignore_cache=args.ignore_cache,
-        )
-        with TabManager(mgr_config) as mgr:
-            target_id = args.target_id
-            if not target_id:
-                tabs = mgr.list_tabs()
-                if args.target_hint:
-                    lowered = args.target_hint.lower()
-                    matched = [
-                        t for t in tabs
-                        if lowered in t.url.lower() or lowered in t.title.lower()
-                    ]
-                    if not matched:
-                        raise RuntimeError(f"No tab matching hint '{args.target_hint}'")
-                    target_id = matched[0].target_id
-                elif tabs:
-                    target_id = tabs[0].target_id
-                else:
-                    raise RuntimeError("No open tabs found")
-            loaded = mgr.refresh(target_id, ignore_cache=args.ignore_cache)
-            _emit({"target_id": target_id, "refreshed": True, "loaded": loaded}, args.format)
-        return
 
-    if args.command == "navigate-tab":
-        mgr_config = TabManagerConfig(
-            chrome_host=args.chrome_host,
-            chrome_port=args.chrome_port,
-            load_timeout_seconds=args.timeout,
-        )
-        with TabManager(mgr_config) as mgr:
-            target_id = args.target_id
-            if not target_id:
-                tabs = mgr.list_tabs()
-                if args.target_hint:
-                    lowered = args.target_hint.lower()
-                    matched = [
-                        t for t in tabs
-                        if lowered in t.url.lower() or lowered in t.title.lower()
-                    ]
-                    if not matched:
-                        raise RuntimeError(f"No tab matching hint '{args.target_hint}'")
-                    target_id = matched[0].target_id
-                elif tabs:
-                    target_id = tabs[0].target_id
-                else:
-                    raise RuntimeError("No open tabs found")
-            loaded = mgr.navigate(target_id, args.url)
-            _emit({"target_id": target_id, "url": args.url, "loaded": loaded}, args.format)
-        return
+def _cmd_diff_captures(args: argparse.Namespace) -> None:
+    from .diffing import compare_capture_files
 
-    if args.command == "open-tab":
-        mgr_config = TabManagerConfig(
-            chrome_host=args.chrome_host,
-            chrome_port=args.chrome_port,
-        )
-        with TabManager(mgr_config) as mgr:
-            handle = mgr.open_tab(args.url)
-            _emit({"target_id": handle.target_id, "url": handle.url}, args.format)
-        return
+    diff = compare_capture_files(args.a, args.b, encryption_key_a=args.a_key, encryption_key_b=args.b_key)
+    _emit(
+        {
+            "headers_added": diff.headers_added,
+            "headers_removed": diff.headers_removed,
+            "method_changed": diff.method_changed,
+        },
+        args.format,
+    )
 
-    if args.command == "close-tab":
-        mgr_config = TabManagerConfig(
-            chrome_host=args.chrome_host,
-            chrome_port=args.chrome_port,
-        )
-        with TabManager(mgr_config) as mgr:
-            success = mgr.close_tab(args.target_id)
-            _emit({"target_id": args.target_id, "closed": success}, args.format)
-        return
 
-    parser.error("Unknown command")
+def _cmd_recipe_save(args: argparse.Namespace) -> None:
+    from .plugins import get_adapter
+    from .recipes import Recipe, save_recipe
+
+    adapter = get_adapter(args.adapter) if args.adapter else None
+    defaults = adapter.defaults() if adapter else None
+    cap = CaptureConfig(
+        target_hint=args.target_hint or (defaults.target_hint if defaults else None),
+        output_file=args.capture_file,
+        filter_host_contains=(defaults.filter_host_contains if defaults else None),
+    )
+    rep = ReplayConfig(
+        capture_file=args.capture_file,
+        request_url=args.request_url,
+        method=args.method,
+        url_contains=args.url_contains or (defaults.replay_url_contains if defaults else None),
+        allowed_domains=list(defaults.allowed_domains) if defaults else [],
+    )
+    path = save_recipe(Recipe(name=args.name, capture=cap, replay=rep), base_dir=args.base_dir)
+    _emit({"saved": str(path), "name": args.name}, args.format)
+
+
+def _cmd_recipe_list(args: argparse.Namespace) -> None:
+    from .recipes import list_recipes
+
+    _emit({"recipes": list_recipes(base_dir=args.base_dir)}, args.format)
+
+
+def _cmd_recipe_run(args: argparse.Namespace) -> None:
+    from .recipes import load_recipe
+
+    recipe = load_recipe(args.name, base_dir=args.base_dir)
+    if args.duration is not None:
+        recipe.capture.duration_seconds = args.duration
+    if args.max_records is not None:
+        recipe.capture.max_records = args.max_records
+    from .capture import capture_requests
+    from .replay import replay_with_capture
+
+    captures = capture_requests(recipe.capture)
+    response = replay_with_capture(recipe.replay)
+    _emit(
+        {
+            "name": args.name,
+            "captured": len(captures),
+            "status_code": response.status_code,
+            "request_url": recipe.replay.request_url,
+        },
+        args.format,
+    )
+
+
+def _cmd_refresh_tab(args: argparse.Namespace) -> None:
+    from .tab_manager import TabManager, TabManagerConfig
+
+    mgr_config = TabManagerConfig(
+        chrome_host=args.chrome_host,
+        chrome_port=args.chrome_port,
+        load_timeout_seconds=args.timeout,
+        ignore_cache=args.ignore_cache,
+    )
+    with TabManager(mgr_config) as mgr:
+        target_id = args.target_id
+        if not target_id:
+            tabs = mgr.list_tabs()
+            if args.target_hint:
+                lowered = args.target_hint.lower()
+                matched = [
+                    t for t in tabs
+                    if lowered in t.url.lower() or lowered in t.title.lower()
+                ]
+                if not matched:
+                    raise RuntimeError(f"No tab matching hint '{args.target_hint}'")
+                target_id = matched[0].target_id
+            elif tabs:
+                target_id = tabs[0].target_id
+            else:
+                raise RuntimeError("No open tabs found")
+        loaded = mgr.refresh(target_id, ignore_cache=args.ignore_cache)
+        _emit({"target_id": target_id, "refreshed": True, "loaded": loaded}, args.format)
+
+
+def _cmd_navigate_tab(args: argparse.Namespace) -> None:
+    from .tab_manager import TabManager, TabManagerConfig
+
+    mgr_config = TabManagerConfig(
+        chrome_host=args.chrome_host,
+        chrome_port=args.chrome_port,
+        load_timeout_seconds=args.timeout,
+    )
+    with TabManager(mgr_config) as mgr:
+        target_id = args.target_id
+        if not target_id:
+            tabs = mgr.list_tabs()
+            if args.target_hint:
+                lowered = args.target_hint.lower()
+                matched = [
+                    t for t in tabs
+                    if lowered in t.url.lower() or lowered in t.title.lower()
+                ]
+                if not matched:
+                    raise RuntimeError(f"No tab matching hint '{args.target_hint}'")
+                target_id = matched[0].target_id
+            elif tabs:
+                target_id = tabs[0].target_id
+            else:
+                raise RuntimeError("No open tabs found")
+        loaded = mgr.navigate(target_id, args.url)
+        _emit({"target_id": target_id, "url": args.url, "loaded": loaded}, args.format)
+
+
+def _cmd_open_tab(args: argparse.Namespace) -> None:
+    from .tab_manager import TabManager, TabManagerConfig
+
+    mgr_config = TabManagerConfig(
+        chrome_host=args.chrome_host,
+        chrome_port=args.chrome_port,
+    )
+    with TabManager(mgr_config) as mgr:
+        handle = mgr.open_tab(args.url)
+        _emit({"target_id": handle.target_id, "url": handle.url}, args.format)
+
+
+def _cmd_close_tab(args: argparse.Namespace) -> None:
+    from .tab_manager import TabManager, TabManagerConfig
+
+    mgr_config = TabManagerConfig(
+        chrome_host=args.chrome_host,
+        chrome_port=args.chrome_port,
+    )
+    with TabManager(mgr_config) as mgr:
+        success = mgr.close_tab(args.target_id)
+        _emit({"target_id": args.target_id, "closed": success}, args.format)
+
+
+_HANDLERS: dict[str, Callable[[argparse.Namespace], None]] = {
+    "capture": _cmd_capture,
+    "replay": _cmd_replay,
+    "list-targets": _cmd_list_targets,
+    "profile-list": _cmd_profile_list,
+    "doctor": _cmd_doctor,
+    "serve": _cmd_serve,
+    "ui": _cmd_ui,
+    "adapter-list": _cmd_adapter_list,
+    "session-health": _cmd_session_health,
+    "diff-captures": _cmd_diff_captures,
+    "recipe-save": _cmd_recipe_save,
+    "recipe-list": _cmd_recipe_list,
+    "recipe-run": _cmd_recipe_run,
+    "refresh-tab": _cmd_refresh_tab,
+    "navigate-tab": _cmd_navigate_tab,
+    "open-tab": _cmd_open_tab,
+    "close-tab": _cmd_close_tab,
+}
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    if argv == ["--version"]:
+        print(f"cookie-monster {_tool_version()}")
+        return
+    if not argv or set(argv) <= {"-h", "--help"}:
+        # Top-level help (or the missing-subcommand error) never needs any
+        # subcommand's arguments.
+        parser = _get_parser(None, subcommand_args=False)
+    else:
+        # None when the subcommand can't be spotted cheaply (e.g. "--form
+        # ndjson", an abbreviated --format); that builds the full parser.
+        parser = _get_parser(_command_from_argv(argv))
+    args = parser.parse_args(argv)
+    handler = _HANDLERS.get(args.command)
+    if handler is None:
+        parser.error("Unknown command")
+    handler(args)
 
 
 if __name__ == "__main__":
@@ -12,7 +12,7 @@ from .exceptions import CaptureError, ReplayError, ReplayPolicyError
 from .hooks import CookieMonsterHooks
 from .policy import ReplayPolicy
 from .recipes import Recipe, list_recipes, load_recipe, save_recipe
-from .replay import replay_with_capture
+from .replay import body_preview, replay_with_capture
 from .results import CaptureResult, ReplayResult, SessionHealthResult
 from .session_health import analyze_session_health
 
@@ -52,7 +52,7 @@ class CookieMonsterClient:
             return ReplayResult(
                 status_code=response.status_code,
                 content_type=response.headers.get("Content-Type", ""),
-                body_preview=response.text[:400],
+                body_preview=body_preview(response),
                 request_url=config.request_url,
             )
         except Exception as exc:  # noqa: BLE001
@@ -14,7 +14,7 @@ class CaptureDiff:
 
 
 def _signature(capture: CapturedRequest) -> tuple[set[str], str]:
-    return ({k.lower() for k in capture.headers.keys()}, capture.method.upper())
+    return (set(capture.header_names), capture.method.upper())
 
 
 def compare_capture_files(path_a: str, path_b: str, encryption_key_a: str | None = None, encryption_key_b: str | None = None) -> CaptureDiff:
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import fields, is_dataclass
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the optional "fast" extra
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(obj: Any) -> Any:
+    # Models such as CapturedRequest serialize through to_dict(); orjson's native
+    # dataclass support would also emit cached properties stored in __dict__.
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    if is_dataclass(obj) and not isinstance(obj, type):
+        # Shallow: nested values are serialized in place rather than copied like asdict().
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+def _escape_non_ascii(match: re.Match[str]) -> str:
+    # Same \uXXXX (surrogate pair above the BMP) escapes as json.dumps' ensure_ascii.
+    code = ord(match.group())
+    if code > 0xFFFF:
+        code -= 0x10000
+        return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+    return f"\\u{code:04x}"
+
+
+def dumps(obj: Any, *, indent: bool = False, ascii: bool = False) -> bytes:  # noqa: A002
+    """Serialize *obj* to compact UTF-8 JSON bytes (orjson when installed).
+
+    With *indent*, the output is pretty-printed with two-space indentation.
+    With *ascii*, non-ASCII characters are escaped so the output is plain
+    ASCII and identical on both backends (the stdlib fallback always escapes).
+    Objects exposing ``to_dict()`` are serialized through it; other dataclass
+    instances are serialized field by field.
+    """
+    if orjson is not None:
+        option = orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        data = orjson.dumps(obj, default=_default, option=option)
+        if ascii and not data.isascii():
+            # Outside strings JSON is ASCII, so every match is string content.
+            data = _NON_ASCII.sub(_escape_non_ascii, data.decode("utf-8")).encode("ascii")
+        return data
+    if indent:
+        return json.dumps(obj, indent=2, default=_default).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Parse JSON from a bytes-like object or ``str`` (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import cached_property
 from typing import Any
 
+from .security_utils import url_host
+
 
 @dataclass
 class CapturedRequest:
@@ -15,6 +18,32 @@ class CapturedRequest:
     resource_type: str | None = None
     post_data: str | None = None
 
+    @cached_property
+    def host(self) -> str:
+        """Lower-cased hostname of :attr:`url`, parsed on first access."""
+        return url_host(self.url)
+
+    @cached_property
+    def lower_headers(self) -> dict[str, str]:
+        """:attr:`headers` keyed by lower-cased name, built on first access.
+
+        Headers are not expected to change after capture; treat the result as read-only.
+        """
+        return {k.lower(): v for k, v in self.headers.items()}
+
+    @cached_property
+    def header_names(self) -> frozenset[str]:
+        """Lower-cased header names, computed on first access (headers are not expected to change)."""
+        return frozenset(self.lower_headers)
+
+    @property
+    def has_authorization_header(self) -> bool:
+        return "authorization" in self.lower_headers
+
+    @property
+    def has_cookie_header(self) -> bool:
+        return "cookie" in self.lower_headers
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "request_id": self.request_id,
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
 from .base import SiteAdapter
 from .builtins import GithubAdapter, GmailAdapter, SupabaseAdapter
 
@@ -21,6 +23,7 @@ def get_adapter(name: str) -> SiteAdapter:
     return _ADAPTERS[key]
 
 
+@lru_cache(maxsize=128)
 def auto_detect_adapter(text: str) -> SiteAdapter | None:
     if not text:
         return None
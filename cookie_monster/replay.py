@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import time
+from http.cookiejar import DefaultCookiePolicy
 from pathlib import Path
 
 import requests
@@ -32,10 +33,37 @@ def _sanitize_headers(headers: dict[str, str]) -> dict[str, str]:
     return {k: v for k, v in headers.items() if k.lower() not in blocked}
 
 
-def replay_with_capture(config: ReplayConfig) -> requests.Response:
+def body_preview(response: requests.Response, limit: int = 400) -> str:
+    """Return the first *limit* characters of *response*'s body.
+
+    Only the leading ``4 * limit`` bytes (enough for *limit* characters in any
+    Unicode encoding) are decoded, so a large body is never decoded in full or
+    run through charset detection. Undeclared charsets are read as UTF-8.
+    """
+    head = response.content[: limit * 4]
+    try:
+        text = head.decode(response.encoding or "utf-8", errors="replace")
+    except LookupError:
+        text = head.decode("utf-8", errors="replace")
+    return text[:limit]
+
+
+def new_replay_session() -> requests.Session:
+    """Return a pooled session for repeated replays.
+
+    The session reuses TCP/TLS connections but never stores response cookies,
+    so one replay cannot leak state into the next: every request carries only
+    the captured headers.
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def replay_with_capture(config: ReplayConfig, session: requests.Session | None = None) -> requests.Response:
     captures = load_captures(config.capture_file, encryption_key=config.encryption_key)
     selected = _pick_capture(captures, config)
-    if config.enforce_capture_host and url_host(selected.url) != url_host(config.request_url):
+    if config.enforce_capture_host and selected.host != url_host(config.request_url):
         raise RuntimeError(
             "Refusing replay to a different host than captured request. "
             "Use --no-enforce-capture-host to override."
@@ -57,7 +85,7 @@ def replay_with_capture(config: ReplayConfig) -> requests.Response:
     last_error: Exception | None = None
     for attempt in range(1, max_attempts + 1):
         try:
-            response = requests.request(
+            response = (session or requests).request(
                 method=config.method.upper(),
                 url=config.request_url,
                 headers=headers,
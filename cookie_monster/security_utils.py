@@ -1,30 +1,37 @@
 from __future__ import annotations
 
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
 
-SENSITIVE_HEADERS = {
-    "authorization",
-    "cookie",
-    "set-cookie",
-    "x-api-key",
-    "apikey",
-    "x-auth-token",
-    "proxy-authorization",
-}
+SENSITIVE_HEADERS = frozenset(
+    {
+        "authorization",
+        "cookie",
+        "set-cookie",
+        "x-api-key",
+        "apikey",
+        "x-auth-token",
+        "proxy-authorization",
+    }
+)
 
 
 def redact_headers(headers: dict[str, str]) -> dict[str, str]:
-    redacted: dict[str, str] = {}
-    for k, v in headers.items():
-        if k.lower() in SENSITIVE_HEADERS:
-            redacted[k] = "***REDACTED***"
-        else:
-            redacted[k] = v
+    """Return *headers* with sensitive values masked.
+
+    When nothing needs masking the input mapping itself is returned, so treat
+    the result as read-only.
+    """
+    sensitive = [k for k in headers if k.lower() in SENSITIVE_HEADERS]
+    if not sensitive:
+        return headers
+    redacted = dict(headers)
+    for k in sensitive:
+        redacted[k] = "***REDACTED***"
     return redacted
 
 
 def url_host(url: str) -> str:
-    return (urlparse(url).hostname or "").lower()
+    return (urlsplit(url).hostname or "").lower()
 
 
 def enforce_allowed_domain(url: str, allowed_domains: list[str]) -> None:
@@ -30,10 +30,10 @@ def analyze_session_health(captures: list[CapturedRequest]) -> SessionHealthResu
     bearer_tokens: list[str] = []
 
     for cap in captures:
-        lower = {k.lower(): str(v) for k, v in cap.headers.items()}
+        lower = cap.lower_headers
         if "cookie" in lower:
             has_cookie = True
-        auth = lower.get("authorization", "")
+        auth = str(lower.get("authorization", ""))
         if auth.lower().startswith("bearer "):
             bearer_tokens.append(auth.split(" ", 1)[1])
 
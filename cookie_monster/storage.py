@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Iterator
 from pathlib import Path
 
 from .crypto import decrypt_text, encrypt_text
+from .json_utils import loads as json_loads
 from .models import CapturedRequest
 
 
@@ -18,22 +20,29 @@ def append_captures(path: str, captures: list[CapturedRequest], encryption_key:
             f.write(line + "\n")
 
 
-def load_captures(path: str, encryption_key: str | None = None) -> list[CapturedRequest]:
+def iter_captures(path: str, encryption_key: str | None = None) -> Iterator[CapturedRequest]:
+    """Yield captures from *path* one line at a time.
+
+    The file is read in binary with a 64 KiB buffer; plaintext lines go to the
+    JSON parser as bytes, skipping a UTF-8 decode per line.
+    """
     capture_file = Path(path)
     if not capture_file.exists():
         raise FileNotFoundError(f"Capture file not found: {path}")
 
-    captures: list[CapturedRequest] = []
-    with capture_file.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
+    with capture_file.open("rb", buffering=65536) as f:
+        for raw in f:
+            raw = raw.strip()
+            if not raw:
                 continue
-            if line.startswith("ENC:"):
+            if raw.startswith(b"ENC:"):
                 if not encryption_key:
                     raise RuntimeError(
                         "Capture file is encrypted. Provide key via --encryption-key or --encryption-key-env."
                     )
-                line = decrypt_text(line, encryption_key)
-            captures.append(CapturedRequest.from_dict(json.loads(line)))
-    return captures
+                raw = decrypt_text(raw.decode("utf-8"), encryption_key)
+            yield CapturedRequest.from_dict(json_loads(raw))
+
+
+def load_captures(path: str, encryption_key: str | None = None) -> list[CapturedRequest]:
+    return list(iter_captures(path, encryption_key=encryption_key))
@@ -67,6 +67,29 @@ class TabManager:
         self._clients[target_id] = client
         return client
 
+    def _page_command(self, target_id: str, method: str, params: dict[str, Any]) -> CDPClient:
+        """Send a Page command to *target_id*, connecting (and caching) a client if needed.
+
+        A new connection pipelines ``Page.enable`` with *method* instead of
+        waiting for the enable reply before sending the command.
+        """
+        client = self._clients.get(target_id)
+        if client is not None:
+            # Events from an earlier command (e.g. a late Page.loadEventFired)
+            # would otherwise satisfy wait_for_load before this one starts.
+            client.clear_events()
+            client.send_command(method, params)
+            return client
+        client = CDPClient(self._ws_url_for_target(target_id))
+        client.connect()
+        try:
+            client.send_commands([("Page.enable", {}), (method, params)])
+        except Exception:
+            client.close()
+            raise
+        self._clients[target_id] = client
+        return client
+
     def _drop_client(self, target_id: str) -> None:
         client = self._clients.pop(target_id, None)
         if client is not None:
@@ -125,16 +148,14 @@ class TabManager:
     def refresh(self, target_id: str, *, ignore_cache: bool | None = None) -> bool:
         """Reload the page in an existing tab. Returns ``True`` when the load event fires."""
         use_ignore_cache = ignore_cache if ignore_cache is not None else self.config.ignore_cache
-        client = self._get_client(target_id)
-        client.reload(ignore_cache=use_ignore_cache)
+        client = self._page_command(target_id, "Page.reload", {"ignoreCache": use_ignore_cache})
         loaded = client.wait_for_load(timeout_seconds=self.config.load_timeout_seconds)
         logger.info("Refreshed tab %s (loaded=%s)", target_id, loaded)
         return loaded
 
     def navigate(self, target_id: str, url: str) -> bool:
         """Navigate an existing tab to *url*. Returns ``True`` when the load event fires."""
-        client = self._get_client(target_id)
-        client.navigate(url)
+        client = self._page_command(target_id, "Page.navigate", {"url": url})
         loaded = client.wait_for_load(timeout_seconds=self.config.load_timeout_seconds)
         logger.info("Navigated tab %s → %s (loaded=%s)", target_id, url, loaded)
         return loaded
@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+import json
+import threading
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer
 from io import BytesIO
 
 import pytest
@@ -13,6 +19,7 @@ class _FakeHandler:
     def __init__(self, body: bytes, content_length: int) -> None:
         self.headers = {"Content-Length": str(content_length)}
         self.rfile = BytesIO(body)
+        self.close_connection = False
 
 
 def test_validate_http_url_accepts_https():
@@ -43,8 +50,10 @@ def test_enforce_local_bind_allows_non_loopback_with_override(monkeypatch):
 
 def test_safe_replay_config_redacts_encryption_key():
     config = ReplayConfig(capture_file="captures.jsonl", request_url="https://example.com", encryption_key="secret")
-    payload = api_server._safe_replay_config(config)
+    payload = json.loads(api_server.json_dumps(api_server._safe_replay_config(config)))  # noqa: SLF001
     assert payload["encryption_key"] == "***REDACTED***"
+    assert payload["request_url"] == "https://example.com"
+    assert config.encryption_key == "secret"
 
 
 def test_is_authorized_with_matching_token():
@@ -63,3 +72,331 @@ def test_capture_sample_redacts_headers_by_default():
     captures = [CapturedRequest("1", "GET", "https://example.com", {"Authorization": "Bearer token"})]
     sample = api_server._capture_sample(captures, redact_output=True)
     assert sample[0]["headers"]["Authorization"] == "***REDACTED***"
+
+
+def test_read_json_body_parses_payload():
+    body = b'{"url": "https://example.com", "n": 2}'
+    handler = _FakeHandler(body=body, content_length=len(body))
+    assert api_server._read_json_body(handler) == {"url": "https://example.com", "n": 2}  # noqa: SLF001
+
+
+@contextmanager
+def _running_server(tmp_path, monkeypatch, api_token=None):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), api_server.make_handler(api_token=api_token))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _request(url: str, payload: dict | None = None, headers: dict | None = None) -> tuple[int, dict]:
+    data = None if payload is None else json.dumps(payload).encode("utf-8")
+    req = urllib.request.Request(url, data=data, headers=headers or {}, method="GET" if data is None else "POST")
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_routes_dispatch_and_unknown_paths_404(tmp_path, monkeypatch):
+    with _running_server(tmp_path, monkeypatch) as base:
+        assert _request(f"{base}/health") == (200, {"ok": True})
+        assert _request(f"{base}/health?probe=1") == (200, {"ok": True})
+        assert _request(f"{base}/nope")[0] == 404
+        assert _request(f"{base}/nope", {})[0] == 404
+
+
+def test_static_ui_routes_serve_bytes_with_content_type(tmp_path, monkeypatch):
+    from cookie_monster.ui import logo_svg
+
+    with _running_server(tmp_path, monkeypatch) as base:
+        with urllib.request.urlopen(f"{base}/ui/logo.svg?v=1", timeout=5) as resp:
+            assert resp.headers["Content-Type"] == "image/svg+xml"
+            assert resp.read() == logo_svg().encode("utf-8")
+        with urllib.request.urlopen(f"{base}/ui", timeout=5) as resp:
+            assert resp.headers["Content-Type"] == "text/html; charset=utf-8"
+            assert int(resp.headers["Content-Length"]) == len(resp.read())
+
+
+def test_inspect_auth_returns_redacted_records(tmp_path, monkeypatch):
+    from cookie_monster.storage import append_captures
+
+    capture_file = tmp_path / "caps.jsonl"
+    append_captures(
+        str(capture_file),
+        [
+            CapturedRequest("1", "GET", "https://api.example.com/a", {"Authorization": "Bearer t"}),
+            CapturedRequest("2", "GET", "https://other.test/b", {"Cookie": "x=1"}),
+        ],
+    )
+    with _running_server(tmp_path, monkeypatch) as base:
+        status, data = _request(
+            f"{base}/ui/inspect-auth",
+            {"url": "https://example.com", "capture_file": str(capture_file), "encryption_key": "unused"},
+        )
+
+    assert status == 200
+    assert data["url_host"] == "example.com"
+    assert [r["request_id"] for r in data["records"]] == ["1"]
+    assert data["records"][0]["headers"]["Authorization"] == "***REDACTED***"
+
+
+def test_parse_target_url_returns_lowercased_host():
+    assert api_server._parse_target_url("https://API.Example.com:8443/x") == (  # noqa: SLF001
+        "https://API.Example.com:8443/x",
+        "api.example.com",
+    )
+    with pytest.raises(ValueError):
+        api_server._parse_target_url("example.com/x")  # noqa: SLF001
+
+
+def test_capture_index_detects_auth_headers_case_insensitively():
+    index = api_server._CaptureIndex([  # noqa: SLF001
+        CapturedRequest("1", "GET", "https://a.test/", {"Accept": "*/*", "COOKIE": "a=b"}),
+        CapturedRequest("2", "GET", "https://a.test/", {"authorization": "Bearer t"}),
+        CapturedRequest("3", "GET", "https://a.test/", {"Accept": "*/*", "X-Cookie": "a"}),
+    ])
+    _, with_auth = index.matching("a.test")
+    assert [c.request_id for c in with_auth] == ["1", "2"]
+
+
+def test_capture_index_matches_host_substring_in_file_order():
+    captures = [
+        CapturedRequest("1", "GET", "https://api.example.com/a", {"Cookie": "x=1"}),
+        CapturedRequest("2", "GET", "https://other.test/b", {"Cookie": "x=2"}),
+        CapturedRequest("3", "GET", "https://example.com/c", {"Accept": "*/*"}),
+        CapturedRequest("4", "GET", "https://api.example.com/d", {"authorization": "Bearer t"}),
+    ]
+    index = api_server._CaptureIndex(captures)  # noqa: SLF001
+    matched, with_auth = index.matching("example.com")
+    assert [c.request_id for c in matched] == ["1", "3", "4"]
+    assert [c.request_id for c in with_auth] == ["1", "4"]
+    assert index.matching("missing.test") == ([], [])
+    assert index.matching("example.com")[0] is matched
+    for i in range(api_server._MATCH_CACHE_SIZE + 10):  # noqa: SLF001
+        index.matching(f"host{i}.test")
+    assert index.matching.cache_info().currsize == api_server._MATCH_CACHE_SIZE  # noqa: SLF001
+
+
+def test_load_index_reuses_result_until_file_changes(tmp_path):
+    from cookie_monster.storage import append_captures
+
+    path = tmp_path / "caps.jsonl"
+    append_captures(str(path), [CapturedRequest("1", "GET", "https://example.com", {"Cookie": "a"})])
+    first = api_server._load_index(str(path), None)  # noqa: SLF001
+    assert api_server._load_index(str(path), None) is first  # noqa: SLF001
+
+    append_captures(str(path), [CapturedRequest("2", "GET", "https://example.com", {"Cookie": "b"})])
+    second = api_server._load_index(str(path), None)  # noqa: SLF001
+    assert second is not first
+    assert len(second.captures) == 2
+
+
+def test_load_index_missing_file_raises():
+    with pytest.raises(FileNotFoundError):
+        api_server._load_index("/nonexistent/caps.jsonl", None)  # noqa: SLF001
+
+
+def test_request_path_strips_query_and_handles_absolute_form():
+    assert api_server._request_path("/ui/check-auth") == "/ui/check-auth"  # noqa: SLF001
+    assert api_server._request_path("/health?x=1") == "/health"  # noqa: SLF001
+    assert api_server._request_path("http://127.0.0.1:8787/health?x=1") == "/health"  # noqa: SLF001
+
+
+def test_api_workers_reads_env(monkeypatch):
+    monkeypatch.delenv("COOKIE_MONSTER_API_WORKERS", raising=False)
+    assert api_server._api_workers() == 1  # noqa: SLF001
+    monkeypatch.setenv("COOKIE_MONSTER_API_WORKERS", "4")
+    assert api_server._api_workers() == 4  # noqa: SLF001
+    monkeypatch.setenv("COOKIE_MONSTER_API_WORKERS", "many")
+    with pytest.raises(RuntimeError):
+        api_server._api_workers()  # noqa: SLF001
+
+
+def test_read_json_body_empty_body_returns_empty_dict():
+    handler = _FakeHandler(body=b"", content_length=0)
+    assert api_server._read_json_body(handler) == {}  # noqa: SLF001
+    assert not handler.close_connection
+    handler.headers.pop("Content-Length")
+    assert api_server._read_json_body(handler) == {}  # noqa: SLF001
+    assert handler.close_connection
+
+
+def test_limit_concurrency_returns_503_when_slots_exhausted(monkeypatch):
+    import threading as _threading
+
+    monkeypatch.setattr(api_server, "_JOB_SLOTS", _threading.BoundedSemaphore(1))
+    monkeypatch.setattr(api_server, "JOB_SLOT_TIMEOUT_SECONDS", 0.01)
+    responses = []
+    monkeypatch.setattr(api_server, "_json_response", lambda h, status, payload: responses.append(status))
+    ran = []
+
+    @api_server._limit_concurrency  # noqa: SLF001
+    def route(handler, payload):
+        ran.append(payload)
+
+    route(object(), {"n": 1})
+    api_server._JOB_SLOTS.acquire()  # noqa: SLF001
+    route(object(), {"n": 2})
+    assert ran == [{"n": 1}]
+    assert responses == [503]
+
+
+def test_capture_sample_redaction_does_not_mutate_captures():
+    headers = {"Cookie": "a=b", "Accept": "*/*"}
+    captures = [CapturedRequest("1", "GET", "https://example.com", headers)]
+    sample = api_server._capture_sample(captures, redact_output=True)  # noqa: SLF001
+    assert sample[0]["headers"] == {"Cookie": "***REDACTED***", "Accept": "*/*"}
+    assert headers["Cookie"] == "a=b"
+
+
+def test_json_dumps_serializes_captures_via_to_dict():
+    from cookie_monster.json_utils import dumps, loads
+
+    cap = CapturedRequest("1", "GET", "https://example.com/x", {"Cookie": "a"})
+    _ = cap.host, cap.header_names  # populate cached properties
+    assert loads(dumps({"sample": api_server._capture_sample([cap], redact_output=False)})) == {  # noqa: SLF001
+        "sample": [cap.to_dict()]
+    }
+    assert dumps({"a": [1], "b": {}}, indent=True) == b'{\n  "a": [\n    1\n  ],\n  "b": {}\n}'
+
+
+def test_session_health_endpoint_serializes_result_dataclass(tmp_path, monkeypatch):
+    from cookie_monster.storage import append_captures
+
+    capture_file = tmp_path / "caps.jsonl"
+    append_captures(str(capture_file), [CapturedRequest("1", "GET", "https://example.com", {"Cookie": "a=b"})])
+    with _running_server(tmp_path, monkeypatch) as base:
+        status, body = _request(f"{base}/session-health", {"capture_file": str(capture_file)})
+    assert status == 200
+    assert body == {"has_cookie": True, "bearer_token_count": 0, "jwt_expired": None, "jwt_expires_at": None}
+
+
+def test_read_json_body_rejects_non_object():
+    handler = _FakeHandler(body=b"[1, 2]", content_length=6)
+    with pytest.raises(ValueError):
+        api_server._read_json_body(handler)  # noqa: SLF001
+
+
+def test_post_requires_token_when_configured(tmp_path, monkeypatch):
+    with _running_server(tmp_path, monkeypatch, api_token="abc123") as base:
+        assert _request(f"{base}/nope", {})[0] == 401
+        assert _request(f"{base}/nope", {}, headers={"Authorization": "Bearer abc123"})[0] == 404
+        assert _request(f"{base}/nope", {}, headers={"X-CM-Token": "abc12"})[0] == 401
+
+
+def test_connections_are_kept_alive_between_requests(tmp_path, monkeypatch):
+    import http.client
+
+    with _running_server(tmp_path, monkeypatch) as base:
+        conn = http.client.HTTPConnection(base.removeprefix("http://"), timeout=5)
+        try:
+            for _ in range(2):
+                conn.request("GET", "/health")
+                resp = conn.getresponse()
+                assert resp.status == 200
+                assert json.loads(resp.read()) == {"ok": True}
+            first_sock = conn.sock
+            conn.request("POST", "/nope", body=b"{}", headers={"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            resp.read()
+            assert resp.status == 404
+            assert conn.sock is first_sock
+        finally:
+            conn.close()
+
+
+def test_read_json_body_empty_object_fast_path(monkeypatch):
+    monkeypatch.setattr(api_server, "json_loads", lambda data: pytest.fail("parser should be skipped"))
+    handler = _FakeHandler(body=b"{}", content_length=2)
+    payload = api_server._read_json_body(handler)  # noqa: SLF001
+    assert payload == {}
+    payload["x"] = 1
+    assert api_server._read_json_body(_FakeHandler(body=b"{}", content_length=2)) == {}  # noqa: SLF001
+
+
+def test_read_json_body_rejects_truncated_body():
+    handler = _FakeHandler(body=b'{"a": 1', content_length=20)
+    with pytest.raises(ValueError):
+        api_server._read_json_body(handler)  # noqa: SLF001
+
+
+def test_read_json_body_reuses_thread_buffer():
+    first = b'{"a": "' + b"x" * 5000 + b'"}'
+    handler = _FakeHandler(body=first, content_length=len(first))
+    assert len(api_server._read_json_body(handler)["a"]) == 5000  # noqa: SLF001
+    second = b'{"b": 2}'
+    handler = _FakeHandler(body=second, content_length=len(second))
+    assert api_server._read_json_body(handler) == {"b": 2}  # noqa: SLF001
+
+
+def test_json_response_headers_match_send_header_output(tmp_path, monkeypatch):
+    import http.client
+
+    with _running_server(tmp_path, monkeypatch, api_token="abc123") as base:
+        conn = http.client.HTTPConnection(base.removeprefix("http://"), timeout=5)
+        try:
+            conn.request("GET", "/health")
+            resp = conn.getresponse()
+            assert resp.read() == b'{"ok":true}'
+            assert (resp.status, resp.reason, resp.version) == (200, "OK", 11)
+            assert resp.getheader("Content-Type") == "application/json"
+            assert resp.getheader("Content-Length") == "11"
+            assert resp.getheader("Date") and resp.getheader("Server")
+            assert resp.getheader("Connection") is None
+
+            conn.request("POST", "/diff", body=b"{}")
+            resp = conn.getresponse()
+            resp.read()
+            assert (resp.status, resp.reason) == (401, "Unauthorized")
+            assert resp.getheader("Connection") == "close"
+        finally:
+            conn.close()
+
+
+def test_read_json_body_closes_connection_for_undelimited_bodies():
+    for headers in ({"Transfer-Encoding": "chunked"}, {"Content-Length": "abc"}, {"Content-Length": "-1"}):
+        handler = _FakeHandler(body=b"{}", content_length=2)
+        handler.headers = headers
+        with pytest.raises(ValueError):
+            api_server._read_json_body(handler)  # noqa: SLF001
+        assert handler.close_connection
+
+
+def test_post_without_content_length_closes_keep_alive_connection(tmp_path, monkeypatch):
+    import http.client
+
+    with _running_server(tmp_path, monkeypatch) as base:
+        conn = http.client.HTTPConnection(base.removeprefix("http://"), timeout=5)
+        try:
+            conn.putrequest("POST", "/nope")
+            conn.endheaders()
+            resp = conn.getresponse()
+            resp.read()
+            assert resp.status == 404
+            assert resp.getheader("Connection") == "close"
+        finally:
+            conn.close()
+
+
+def test_run_server_installs_shared_job_slots(monkeypatch):
+    import multiprocessing
+
+    class _Server:
+        def __init__(self, address, handler):
+            pass
+
+        def serve_forever(self):
+            pass
+
+    monkeypatch.setattr(api_server, "_JOB_SLOTS", api_server._JOB_SLOTS)  # noqa: SLF001
+    monkeypatch.setattr(api_server, "make_handler", lambda api_token=None: object)
+    shared = multiprocessing.BoundedSemaphore(api_server.MAX_CONCURRENT_JOBS)
+    api_server._run_server("127.0.0.1", 0, None, _Server, shared)  # noqa: SLF001
+    assert api_server._JOB_SLOTS is shared  # noqa: SLF001
@@ -6,7 +6,7 @@ import json
 
 import pytest
 
-from cookie_monster.browser_profiles import list_profiles, resolve_profile
+from cookie_monster.browser_profiles import default_user_data_dir, list_profiles, resolve_profile
 
 # ── resolve_profile ──────────────────────────────────────────────────────────
 
@@ -99,3 +99,61 @@ def test_list_profiles_sorts_by_directory(tmp_path):
     profiles = list_profiles(str(tmp_path))
     dirs = [p["profile_directory"] for p in profiles]
     assert dirs == ["Default", "Profile 1", "Profile 2"]
+
+
+def test_list_profiles_reuses_parse_until_local_state_changes(tmp_path):
+    import os
+
+    from cookie_monster.browser_profiles import _cached_profiles
+
+    local_state = tmp_path / "Local State"
+    local_state.write_text(json.dumps({
+        "profile": {"info_cache": {"Default": {"name": "A", "user_name": "a@example.com"}}}
+    }))
+
+    first = list_profiles(str(tmp_path))
+    first[0]["name"] = "mutated"
+
+    misses = _cached_profiles.cache_info().misses
+    assert list_profiles(str(tmp_path))[0]["name"] == "A"
+    assert _cached_profiles.cache_info().misses == misses
+
+    local_state.write_text(json.dumps({
+        "profile": {"info_cache": {"Profile 9": {"name": "B", "user_name": "b@example.com"}}}
+    }))
+    stat = local_state.stat()
+    os.utime(local_state, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert [p["profile_directory"] for p in list_profiles(str(tmp_path))] == ["Profile 9"]
+    assert _cached_profiles.cache_info().misses == misses + 1
+
+
+def test_resolve_profile_first_match_in_directory_order_wins(tmp_path):
+    local_state = tmp_path / "Local State"
+    local_state.write_text(json.dumps({
+        "profile": {
+            "info_cache": {
+                "Profile 2": {"name": "Other", "user_name": "Shared@Example.com"},
+                "Profile 1": {"name": "shared@example.com", "user_name": ""},
+            }
+        }
+    }))
+
+    _, profile_dir = resolve_profile(
+        email="  SHARED@example.com ",
+        browser="chrome",
+        user_data_dir=str(tmp_path),
+    )
+    assert profile_dir == "Profile 1"
+
+
+def test_default_user_data_dir_caches_hits_only(monkeypatch, tmp_path):
+    monkeypatch.setattr("cookie_monster.browser_profiles._default_dirs", {})
+    monkeypatch.setattr("cookie_monster.browser_profiles.platform.system", lambda: "Darwin")
+    monkeypatch.setattr("cookie_monster.browser_profiles.Path.home", lambda: tmp_path)
+    assert default_user_data_dir("chrome") is None
+
+    chrome_dir = tmp_path / "Library" / "Application Support" / "Google" / "Chrome"
+    chrome_dir.mkdir(parents=True)
+    assert default_user_data_dir("chrome") == str(chrome_dir)
+    chrome_dir.rmdir()
+    assert default_user_data_dir("Chrome") == str(chrome_dir)
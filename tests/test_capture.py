@@ -1,3 +1,5 @@
+import pytest
+
 from cookie_monster.capture import capture_requests
 from cookie_monster.config import CaptureConfig
 
@@ -40,6 +42,7 @@ class FakeCDPClient:
 
     def send_command(self, method, params):
         assert method == "Network.enable"
+        assert params["maxResourceBufferSize"] <= params["maxTotalBufferSize"]
         return {}
 
     def read_event(self, timeout_seconds=1.0):
@@ -47,6 +50,13 @@ class FakeCDPClient:
             return None
         return self.events.pop(0)
 
+    def read_events(self, timeout_seconds=1.0, max_events=256, methods=None):
+        event = self.read_event(timeout_seconds)
+        return [event] if event and (methods is None or event.get("method") in methods) else []
+
+    def clear_events(self):
+        return None
+
 
 def test_capture_filters_to_auth_headers_and_persists(monkeypatch):
     saved = {}
@@ -136,3 +146,307 @@ def test_capture_post_data_falls_back_to_cdp_query(monkeypatch):
     captures = capture_requests(cfg)
     assert captures
     assert captures[0].post_data == "fallback-body"
+
+
+class FakeCDPExtraInfoFirst(FakeCDPClient):
+    def __init__(self, ws_url):
+        super().__init__(ws_url)
+        self.events[0], self.events[1] = self.events[1], self.events[0]
+
+
+def test_capture_emits_when_extra_info_arrives_before_request(monkeypatch):
+    monkeypatch.setattr("cookie_monster.capture.get_websocket_debug_url", lambda *args, **kwargs: "ws://fake")
+    monkeypatch.setattr("cookie_monster.capture.CDPClient", FakeCDPExtraInfoFirst)
+    monkeypatch.setattr("cookie_monster.capture.append_captures", lambda path, captures, encryption_key=None: None)
+
+    cfg = CaptureConfig(duration_seconds=1, max_records=10, target_hint="GitHub.com")
+    captures = capture_requests(cfg)
+
+    assert len(captures) == 1
+    assert captures[0].url == "https://github.com/settings/profile"
+    assert set(captures[0].headers) == {"Cookie", "Authorization"}
+
+
+class FakeCDPBatch(FakeCDPClient):
+    def read_events(self, timeout_seconds=1.0, max_events=256, methods=None):
+        batch = [e for e in self.events if e and (methods is None or e.get("method") in methods)]
+        self.events = []
+        return batch
+
+
+def test_capture_merges_events_from_one_batch_before_emitting(monkeypatch):
+    monkeypatch.setattr("cookie_monster.capture.get_websocket_debug_url", lambda *args, **kwargs: "ws://fake")
+    monkeypatch.setattr("cookie_monster.capture.CDPClient", FakeCDPBatch)
+    monkeypatch.setattr("cookie_monster.capture.append_captures", lambda path, captures, encryption_key=None: None)
+
+    cfg = CaptureConfig(duration_seconds=1, max_records=10, target_hint="github.com", include_all_headers=True)
+    captures = capture_requests(cfg)
+
+    assert len(captures) == 1
+    assert set(captures[0].headers) == {"Accept", "Cookie", "Authorization"}
+
+
+def test_cdp_read_events_drains_buffered_frames(monkeypatch):
+    import json
+    import socket
+
+    from cookie_monster.cdp import CDPClient
+
+    idle, peer = socket.socketpair()
+
+    class FakeSock:
+        def __init__(self, ws):
+            self.ws = ws
+
+        def pending(self):
+            return len(self.ws.frames)
+
+        def fileno(self):
+            return idle.fileno()
+
+    class FakeWS:
+        def __init__(self, frames):
+            self.frames = [json.dumps(f) for f in frames]
+            self.timeouts = []
+            self.sock = FakeSock(self)
+
+        def settimeout(self, timeout):
+            self.timeouts.append(timeout)
+
+        def recv_data(self):
+            return 1, self.frames.pop(0).encode("utf-8")
+
+    client = CDPClient("ws://fake")
+    client._ws = FakeWS([{"method": "A"}, {"id": 1, "result": {}}, {"method": "B"}, {"method": "C"}])
+
+    try:
+        assert [e["method"] for e in client.read_events(max_events=2)] == ["A", "B"]
+        assert [e["method"] for e in client.read_events()] == ["C"]
+        assert client._ws.timeouts == [1.0]
+
+        client._ws.frames = ['{"method":"A","params":{"big":[1,2,3]}}', '{"method":"B"}', '{"params":{},"method":"A"}']
+        decoded = []
+        monkeypatch.setattr("cookie_monster.cdp.json_loads", lambda raw: decoded.append(raw) or json.loads(raw))
+        assert [e["method"] for e in client.read_events(methods=["B"])] == ["B"]
+        assert decoded == [b'{"method":"B"}', b'{"params":{},"method":"A"}']
+    finally:
+        idle.close()
+        peer.close()
+
+
+def test_capture_reuses_pooled_cdp_connection(monkeypatch):
+    from cookie_monster.capture import CDPClientPool
+
+    created = []
+
+    class PooledFake(FakeCDPClient):
+        def __init__(self, ws_url):
+            super().__init__(ws_url)
+            self.websocket_url = ws_url
+            self.commands = []
+            self.closed = False
+            created.append(self)
+
+        def send_command(self, method, params):
+            self.commands.append(method)
+            return {}
+
+        def close(self):
+            self.closed = True
+
+    monkeypatch.setattr("cookie_monster.capture.get_websocket_debug_url", lambda *args, **kwargs: "ws://fake")
+    monkeypatch.setattr("cookie_monster.capture.CDPClient", PooledFake)
+    monkeypatch.setattr("cookie_monster.capture.append_captures", lambda path, captures, encryption_key=None: None)
+
+    pool = CDPClientPool()
+    cfg = CaptureConfig(duration_seconds=1, max_records=1, target_hint="github.com")
+    assert len(capture_requests(cfg, pool=pool)) == 1
+    created[0].events = [
+        {
+            "method": "Network.requestWillBeSent",
+            "params": {"requestId": "2", "request": {"url": "https://github.com/x", "headers": {"Cookie": "c"}}},
+        }
+    ]
+    assert len(capture_requests(cfg, pool=pool)) == 1
+
+    assert len(created) == 1
+    assert created[0].commands == ["Network.enable", "Network.disable", "Network.enable", "Network.disable"]
+    pool.close()
+    assert created[0].closed
+
+
+def test_request_filter_checks_only_configured_fields():
+    from cookie_monster.capture import _make_request_filter, _url_parts
+
+    _url_parts.cache_clear()
+    url = "https://API.GitHub.com/Graphql?q=1"
+    matches = _make_request_filter(
+        CaptureConfig(
+            filter_host_contains="GitHub",
+            filter_path_contains="/graphql",
+            filter_method="get",
+            filter_resource_type="xhr",
+        )
+    )
+    assert not matches(url, "POST", "XHR")
+    assert not matches(url, "GET", None)
+    assert _url_parts.cache_info().misses == 0  # rejected before the URL is parsed
+    assert matches(url, "GET", "XHR")
+    assert matches(url, "GET", "XHR")
+    assert _url_parts.cache_info().misses == 1
+
+    assert _make_request_filter(CaptureConfig(filter_host_contains="gitlab"))(url, "GET", None) is False
+    assert _make_request_filter(CaptureConfig())("", "", None) is True
+
+
+def test_cdp_send_command_sends_bytes_and_keeps_events_for_reads():
+    import json
+
+    from cookie_monster.cdp import CDPClient
+
+    class FakeWS:
+        def __init__(self):
+            self.sent = []
+            self.timeouts = []
+            self.frames = [
+                (1, b'{"method":"Network.dataReceived","params":{}}'),
+                (1, b'{"id":0,"result":{}}'),
+                (1, b'{"id":1,"result":{"ok":true}}'),
+            ]
+
+        def send(self, data):
+            self.sent.append(data)
+
+        def settimeout(self, timeout):
+            self.timeouts.append(timeout)
+
+        def recv_data(self):
+            return self.frames.pop(0)
+
+    client = CDPClient("ws://fake")
+    client._ws = FakeWS()
+    client._recv_timeout = 1.0  # as left behind by read_events()
+    assert client.send_command("Network.enable") == {"ok": True}
+    assert client._ws.timeouts == [client.timeout_seconds]
+    assert json.loads(client._ws.sent[0]) == {"id": 1, "method": "Network.enable", "params": {}}
+    assert isinstance(client._ws.sent[0], bytes)
+    assert client.read_event() == {"method": "Network.dataReceived", "params": {}}
+
+
+def test_capture_flushes_incrementally_and_on_error(monkeypatch):
+    writes = []
+
+    def request_event(request_id):
+        return {
+            "method": "Network.requestWillBeSent",
+            "params": {"requestId": request_id, "request": {"url": "https://github.com/", "headers": {"Cookie": "c"}}},
+        }
+
+    class FailingAfterTwo(FakeCDPClient):
+        def __init__(self, ws_url):
+            super().__init__(ws_url)
+            self.events = [request_event("a"), request_event("b")]
+
+        def read_events(self, timeout_seconds=1.0, max_events=256, methods=None):
+            if not self.events:
+                raise ConnectionError("tab closed")
+            return [self.events.pop(0)]
+
+    monkeypatch.setattr("cookie_monster.capture._FLUSH_EVERY_RECORDS", 1)
+    monkeypatch.setattr("cookie_monster.capture.get_websocket_debug_url", lambda *args, **kwargs: "ws://fake")
+    monkeypatch.setattr("cookie_monster.capture.CDPClient", FailingAfterTwo)
+    monkeypatch.setattr(
+        "cookie_monster.capture.append_captures",
+        lambda path, captures, encryption_key=None: writes.append([c.request_id for c in captures]),
+    )
+
+    cfg = CaptureConfig(duration_seconds=5, max_records=10, target_hint="github.com")
+    with pytest.raises(ConnectionError):
+        capture_requests(cfg)
+    assert writes == [["a"], ["b"]]
+
+    monkeypatch.setattr("cookie_monster.capture._FLUSH_EVERY_RECORDS", 256)
+    writes.clear()
+    with pytest.raises(ConnectionError):
+        capture_requests(cfg)
+    assert writes == [["a", "b"]]
+
+    def failing_flush(path, captures, encryption_key=None):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("cookie_monster.capture.append_captures", failing_flush)
+    with pytest.raises(ConnectionError):
+        capture_requests(cfg)
+
+
+def test_normalize_post_data_truncates_on_utf8_byte_budget():
+    from cookie_monster.capture import _normalize_post_data
+
+    assert _normalize_post_data(None, 10) is None
+    assert _normalize_post_data("ab", 8) == "ab"
+    assert _normalize_post_data("héllo", 6) == "héllo"
+    assert _normalize_post_data("héllo", 5) == "héll"
+    assert _normalize_post_data("ééé", 5) == "éé"
+    assert _normalize_post_data(123, 8) == "123"
+
+
+def test_cdp_send_command_ignores_replies_to_abandoned_commands():
+    from cookie_monster.cdp import CDPClient
+
+    class FakeWS:
+        def __init__(self, frames):
+            self.frames = frames
+
+        def send(self, data):
+            return None
+
+        def settimeout(self, timeout):
+            return None
+
+        def recv_data(self):
+            frame = self.frames.pop(0)
+            if isinstance(frame, Exception):
+                raise frame
+            return 1, frame
+
+    client = CDPClient("ws://fake")
+    client._ws = FakeWS([TimeoutError(), b'{"id":1,"result":{"late":true}}', b'{"id":2,"error":{"code":-1}}'])
+    with pytest.raises(TimeoutError):
+        client.send_command("Network.getRequestPostData")
+    with pytest.raises(RuntimeError, match="CDP command failed"):
+        client.send_command("Network.enable")
+    assert client._replies == {}
+
+
+def test_cdp_send_commands_pipelines_and_collects_out_of_order_replies():
+    import json
+
+    from cookie_monster.cdp import CDPClient
+
+    class FakeWS:
+        def __init__(self):
+            self.sent = []
+            self.frames = [
+                b'{"id":2,"result":{"second":true}}',
+                b'{"method":"Page.loadEventFired","params":{}}',
+                b'{"id":1,"result":{}}',
+            ]
+
+        def send(self, data):
+            self.sent.append(json.loads(data))
+
+        def settimeout(self, timeout):
+            return None
+
+        def recv_data(self):
+            assert len(self.sent) == 2  # nothing is read before both commands are out
+            return 1, self.frames.pop(0)
+
+    client = CDPClient("ws://fake")
+    client._ws = FakeWS()
+    results = client.send_commands([("Page.enable", None), ("Page.reload", {"ignoreCache": True})])
+
+    assert results == [{}, {"second": True}]
+    assert [m["method"] for m in client._ws.sent] == ["Page.enable", "Page.reload"]
+    assert client.read_event() == {"method": "Page.loadEventFired", "params": {}}
+    assert client._replies == {}
@@ -24,6 +24,21 @@ def test_audience_domain_handles_empty():
     assert isinstance(result, str)
 
 
+def test_audience_domain_fast_path_matches_urlsplit():
+    from urllib.parse import urlsplit
+
+    for url in [
+        "http://a.com?x=/y",
+        "https://a.com#frag/x",
+        "https://user:pw@host.com:8443/x",
+        "https://a.com",
+        "http://[::1]:80/x",
+        "HTTP://Upper.com/x",
+    ]:
+        assert audience_domain(url) == urlsplit(url).netloc
+    assert audience_domain("http://[::1/x") == "http://[::1/x"
+
+
 # ── extract_tokens ────────────────────────────────────────────────────────────
 
 
@@ -53,6 +68,11 @@ def test_extract_tokens_case_insensitive():
     assert tokens["authorization"] == "lower"
 
 
+def test_extract_tokens_first_case_variant_in_header_order_wins():
+    captures = [{"headers": {"cookie": "first", "Cookie": "second"}}, {"headers": {"COOKIE": "later"}}]
+    assert extract_tokens(captures, ["Cookie"]) == {"cookie": "first"}
+
+
 def test_extract_tokens_empty_captures():
     tokens = extract_tokens([], ["cookie"])
     assert tokens == {"cookie": None}
@@ -1,6 +1,10 @@
+import io
 import json
 
+import pytest
+
 from cookie_monster import cli
+from cookie_monster.config import DEFAULT_HEADER_ALLOWLIST, CaptureConfig
 from cookie_monster.models import CapturedRequest
 
 
@@ -9,12 +13,14 @@ class DummyResponse:
         self.status_code = 200
         self.headers = {"Content-Type": "application/json"}
         self.text = "{\"ok\": true}"
+        self.content = self.text.encode("utf-8")
+        self.encoding = "utf-8"
 
 
 def test_main_capture_command_prints_summary(monkeypatch, capsys):
     monkeypatch.setattr("sys.argv", ["cookie-monster", "capture", "--duration", "1"])
     monkeypatch.setattr(
-        "cookie_monster.cli.capture_requests",
+        "cookie_monster.capture.capture_requests",
         lambda config: [
             CapturedRequest("1", "GET", "https://example.com", {"Cookie": "x=1"}),
             CapturedRequest("2", "GET", "https://example.com", {"Cookie": "x=2"}),
@@ -54,10 +60,10 @@ def test_main_capture_launches_chrome_with_profile(monkeypatch, capsys):
         called["launch"] = kwargs
         return DummyProc()
 
-    monkeypatch.setattr("cookie_monster.cli.launch_browser", fake_launch)
-    monkeypatch.setattr("cookie_monster.cli.wait_for_debug_endpoint", lambda host, port: None)
+    monkeypatch.setattr("cookie_monster.chrome_launcher.launch_browser", fake_launch)
+    monkeypatch.setattr("cookie_monster.chrome_launcher.wait_for_debug_endpoint", lambda host, port: None)
     monkeypatch.setattr(
-        "cookie_monster.cli.capture_requests",
+        "cookie_monster.capture.capture_requests",
         lambda config: [CapturedRequest("1", "GET", "https://example.com", {"Cookie": "x=1"})],
     )
 
@@ -83,7 +89,7 @@ def test_main_replay_command_prints_preview(monkeypatch, capsys):
             "captures.jsonl",
         ],
     )
-    monkeypatch.setattr("cookie_monster.cli.replay_with_capture", lambda config: DummyResponse())
+    monkeypatch.setattr("cookie_monster.replay.replay_with_capture", lambda config: DummyResponse())
 
     cli.main()
     out = capsys.readouterr().out
@@ -117,10 +123,10 @@ def test_main_capture_edge_uses_browser_path(monkeypatch, capsys):
         called["launch"] = kwargs
         return DummyProc()
 
-    monkeypatch.setattr("cookie_monster.cli.launch_browser", fake_launch)
-    monkeypatch.setattr("cookie_monster.cli.wait_for_debug_endpoint", lambda host, port: None)
+    monkeypatch.setattr("cookie_monster.chrome_launcher.launch_browser", fake_launch)
+    monkeypatch.setattr("cookie_monster.chrome_launcher.wait_for_debug_endpoint", lambda host, port: None)
     monkeypatch.setattr(
-        "cookie_monster.cli.capture_requests",
+        "cookie_monster.capture.capture_requests",
         lambda config: [CapturedRequest("1", "GET", "https://example.com", {"Cookie": "x=1"})],
     )
 
@@ -134,10 +140,10 @@ def test_ui_command_starts_server_without_open(monkeypatch):
     monkeypatch.setattr("sys.argv", ["cookie-monster", "ui", "--no-open", "--host", "127.0.0.1", "--port", "9999"])
     called = {}
     monkeypatch.setattr(
-        "cookie_monster.cli.serve_api",
+        "cookie_monster.api_server.serve_api",
         lambda host, port, api_token=None: called.update({"host": host, "port": port, "api_token": api_token}),
     )
-    monkeypatch.setattr("cookie_monster.cli.webbrowser.open", lambda *_: (_ for _ in ()).throw(AssertionError("should not open")))
+    monkeypatch.setattr("webbrowser.open", lambda *_: (_ for _ in ()).throw(AssertionError("should not open")))
     cli.main()
     assert called["host"] == "127.0.0.1"
     assert called["port"] == 9999
@@ -149,10 +155,170 @@ def test_serve_command_uses_api_token_env(monkeypatch):
     monkeypatch.setenv("CM_API_TOKEN_TEST", "abc123")
     called = {}
     monkeypatch.setattr(
-        "cookie_monster.cli.serve_api",
+        "cookie_monster.api_server.serve_api",
         lambda host, port, api_token=None: called.update({"host": host, "port": port, "api_token": api_token}),
     )
     cli.main()
     assert called["host"] == "127.0.0.1"
     assert called["port"] == 8787
     assert called["api_token"] == "abc123"
+
+
+def test_importing_cli_does_not_load_command_dependencies():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, cookie_monster.cli; "
+        "print(sorted(m for m in ('cookie_monster.capture', 'cookie_monster.tab_manager', 'websocket', "
+        "'cryptography', 'requests', 'cookie_monster.plugins') if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
+
+
+def test_parser_configures_only_the_requested_subcommand():
+    assert cli._command_from_argv(["--format", "ndjson", "replay", "--request-url", "x"]) == "replay"  # noqa: SLF001
+    assert cli._command_from_argv(["--version"]) is None  # noqa: SLF001
+    assert cli._command_from_argv(["not-a-command"]) is None  # noqa: SLF001
+
+    parser = cli.build_parser("replay")
+    args = parser.parse_args(["replay", "--request-url", "https://example.com"])
+    assert args.request_url == "https://example.com"
+    with pytest.raises(SystemExit):
+        parser.parse_args(["capture", "--duration", "1"])  # capture's arguments were not added
+    assert cli.build_parser().parse_args(["capture", "--duration", "1"]).duration == 1
+
+
+def test_adapter_flag_is_validated_when_given(capsys):
+    parser = cli.build_parser("replay")
+    args = parser.parse_args(["replay", "--request-url", "https://x", "--adapter", "github"])
+    assert args.adapter == "github"
+    with pytest.raises(SystemExit):
+        parser.parse_args(["replay", "--request-url", "https://x", "--adapter", "nope"])
+    assert "invalid choice: 'nope' (choose from github, gmail, supabase)" in capsys.readouterr().err
+
+
+def test_ndjson_format_prints_one_compact_line(monkeypatch, capsys):
+    monkeypatch.setattr("sys.argv", ["cookie-monster", "--format", "ndjson", "capture", "--duration", "1"])
+    monkeypatch.setattr(
+        "cookie_monster.capture.capture_requests",
+        lambda config: [CapturedRequest("1", "GET", "https://example.com", {"Cookie": "x=1"})],
+    )
+
+    cli.main()
+    out = capsys.readouterr().out
+    assert out.count("\n") == 1
+    assert out.startswith('{"captured":1,')
+    assert json.loads(out)["sample"][0]["url"] == "https://example.com"
+
+
+def test_ndjson_falls_back_to_print_without_binary_stdout(monkeypatch):
+    stream = io.StringIO()
+    monkeypatch.setattr("sys.stdout", stream)
+    cli._emit({"ok": True, "name": "café"}, "ndjson")  # noqa: SLF001
+    assert json.loads(stream.getvalue()) == {"ok": True, "name": "café"}
+    assert stream.getvalue() == '{"ok":true,"name":"caf\\u00e9"}\n'
+
+
+def test_capture_redact_output_masks_sample_without_touching_captures(monkeypatch, capsys):
+    captured = CapturedRequest("1", "GET", "https://example.com", {"Cookie": "x=1", "Accept": "*/*"})
+    monkeypatch.setattr("sys.argv", ["cookie-monster", "capture", "--duration", "1", "--redact-output"])
+    monkeypatch.setattr("cookie_monster.capture.capture_requests", lambda config: [captured])
+
+    cli.main()
+    data = json.loads(capsys.readouterr().out)
+    assert data["sample"][0]["headers"] == {"Cookie": "***REDACTED***", "Accept": "*/*"}
+    assert captured.headers["Cookie"] == "x=1"
+
+
+def test_version_is_resolved_only_when_requested(monkeypatch, capsys):
+    calls = []
+    monkeypatch.setattr(cli, "version", lambda name: calls.append(name) or "1.2.3")
+    cli._tool_version.cache_clear()  # noqa: SLF001
+    try:
+        parser = cli.build_parser("ui")
+        assert calls == []
+        with pytest.raises(SystemExit) as exc:
+            parser.parse_args(["--version"])
+        assert exc.value.code == 0
+        assert capsys.readouterr().out.endswith(" 1.2.3\n")
+        cli._tool_version()  # noqa: SLF001
+        assert calls == ["cookie-monster-cli"]
+    finally:
+        cli._tool_version.cache_clear()  # noqa: SLF001
+
+
+def test_main_version_and_help_skip_subcommand_arguments(monkeypatch, capsys):
+    monkeypatch.setattr("sys.argv", ["cookie-monster", "--version"])
+    monkeypatch.setattr(cli, "_get_parser", lambda *a, **k: pytest.fail("parser built for --version"))
+    cli.main()
+    assert capsys.readouterr().out.startswith("cookie-monster ")
+
+    monkeypatch.undo()
+    monkeypatch.setattr("sys.argv", ["cookie-monster", "--help"])
+    monkeypatch.setattr(cli, "_SUBCOMMANDS", {
+        name: (help_text, lambda p: pytest.fail("subcommand configured for --help"))
+        for name, (help_text, _) in cli._SUBCOMMANDS.items()  # noqa: SLF001
+    })
+    monkeypatch.setattr(cli, "_get_parser", cli.build_parser)
+    with pytest.raises(SystemExit) as exc:
+        cli.main()
+    assert exc.value.code == 0
+    assert "session-health" in capsys.readouterr().out
+
+
+def test_every_subcommand_has_a_handler():
+    assert set(cli._HANDLERS) == set(cli._SUBCOMMANDS)  # noqa: SLF001
+
+
+def test_capture_defaults_to_config_header_allowlist(monkeypatch, capsys):
+    seen = {}
+    monkeypatch.setattr("sys.argv", ["cookie-monster", "capture", "--duration", "1"])
+    monkeypatch.setattr("cookie_monster.capture.capture_requests", lambda config: seen.setdefault("config", config) and [])
+
+    cli.main()
+    capsys.readouterr()
+    assert seen["config"].header_allowlist == CaptureConfig().header_allowlist
+    assert seen["config"].header_allowlist is not DEFAULT_HEADER_ALLOWLIST
+
+
+def test_replay_merges_adapter_domains_after_explicit_ones(monkeypatch, capsys):
+    seen = {}
+    monkeypatch.setattr(
+        "sys.argv",
+        [
+            "cookie-monster", "replay", "--request-url", "https://api.github.com/user",
+            "--adapter", "github", "--allowed-domain", "example.com", "--allowed-domain", "github.com",
+        ],
+    )
+    monkeypatch.setattr(
+        "cookie_monster.replay.replay_with_capture",
+        lambda config: seen.setdefault("config", config) and DummyResponse(),
+    )
+
+    cli.main()
+    capsys.readouterr()
+    assert seen["config"].allowed_domains == ["example.com", "github.com", "api.github.com"]
+
+
+def test_abbreviated_top_level_option_still_parses_subcommand_args(monkeypatch, capsys):
+    monkeypatch.setattr("sys.argv", ["cookie-monster", "--form", "ndjson", "adapter-list", "--verbose"])
+
+    cli.main()
+    data = json.loads(capsys.readouterr().out)
+    assert data["adapters"][0]["name"] == "github"
+
+
+def test_pretty_output_is_ascii_escaped_like_stdlib_json(capsys):
+    payload = {"profiles": [{"name": "日本", "emoji": "😀"}]}
+    cli._emit(payload, "json")  # noqa: SLF001
+    out = capsys.readouterr().out
+    assert out == json.dumps(payload, indent=2) + "\n"
+    assert out.isascii()
+
+
+def test_ndjson_output_is_ascii_escaped_like_stdlib_json(capsys):
+    payload = {"name": "日本", "emoji": "😀"}
+    cli._emit(payload, "ndjson")  # noqa: SLF001
+    assert capsys.readouterr().out == json.dumps(payload, separators=(",", ":")) + "\n"
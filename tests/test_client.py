@@ -40,6 +40,8 @@ def test_client_capture_and_replay(monkeypatch):
         status_code = 200
         headers = {"Content-Type": "application/json"}
         text = '{"ok":true}'
+        content = b'{"ok":true}'
+        encoding = None
 
     monkeypatch.setattr("cookie_monster.client.replay_with_capture", lambda cfg: R())
 
@@ -71,6 +73,8 @@ def test_client_async_methods(monkeypatch):
         status_code = 200
         headers = {"Content-Type": "application/json"}
         text = '{"ok":true}'
+        content = b'{"ok":true}'
+        encoding = None
 
     monkeypatch.setattr("cookie_monster.client.replay_with_capture", lambda cfg: R())
 
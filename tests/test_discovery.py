@@ -6,7 +6,7 @@ from cookie_monster.chrome_discovery import get_websocket_debug_url, list_target
 def test_list_targets_retries_then_succeeds(monkeypatch):
     attempts = {"count": 0}
 
-    def fake_read_json(url):
+    def fake_read_json(host, port, path="/json"):
         attempts["count"] += 1
         if attempts["count"] < 3:
             raise ConnectionError("not ready")
@@ -51,3 +51,85 @@ def test_get_websocket_debug_url_raises_if_no_pages(monkeypatch):
     )
     with pytest.raises(RuntimeError):
         get_websocket_debug_url("127.0.0.1", 9222)
+
+
+def test_list_targets_reuses_one_connection():
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from cookie_monster import chrome_discovery
+
+    connections = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            connections.append(self.client_address)
+            super().setup()
+
+        def do_GET(self):  # noqa: N802
+            body = b'[{"type": "page", "id": "1"}]'
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            return None
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    try:
+        for _ in range(3):
+            assert list_targets(host, port) == [{"type": "page", "id": "1"}]
+        assert len(connections) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+        conn = chrome_discovery._connections.pop((host, port), None)  # noqa: SLF001
+        if conn is not None:
+            conn.close()
+
+
+def test_slow_endpoint_does_not_block_other_endpoints(monkeypatch):
+    import threading
+
+    from cookie_monster import chrome_discovery
+
+    release = threading.Event()
+
+    class FakeResponse:
+        status = 200
+
+        def read(self):
+            return b"[]"
+
+    class FakeConnection:
+        def __init__(self, host, port, timeout=None):
+            self.port = port
+
+        def request(self, method, path):
+            if self.port == 1:
+                release.wait(5)
+
+        def getresponse(self):
+            return FakeResponse()
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(chrome_discovery, "_connections", {})
+    monkeypatch.setattr(chrome_discovery.http.client, "HTTPConnection", FakeConnection)
+    slow = threading.Thread(target=chrome_discovery._read_json, args=("h", 1))  # noqa: SLF001
+    slow.start()
+    try:
+        done = []
+        fast = threading.Thread(target=lambda: done.append(chrome_discovery._read_json("h", 2)))  # noqa: SLF001
+        fast.start()
+        fast.join(1)
+        assert done == [[]]
+    finally:
+        release.set()
+        slow.join()
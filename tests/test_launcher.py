@@ -66,6 +66,7 @@ def test_launch_browser_windows_handles_spaces(monkeypatch):
         kernel32 = _FakeKernel32()
 
     monkeypatch.setattr("cookie_monster.chrome_launcher.ctypes.windll", _FakeWindll(), raising=False)
+    monkeypatch.setattr("cookie_monster.chrome_launcher._short_paths", {})
 
     proc = chrome_launcher.launch_browser(
         browser="chrome",
@@ -95,7 +96,7 @@ def test_launch_browser_windows_handles_spaces(monkeypatch):
 
 
 def test_wait_for_debug_endpoint_retries(monkeypatch):
-    state = {"count": 0}
+    state = {"count": 0, "connects": 0}
 
     class DummyResp:
         def __enter__(self):
@@ -104,28 +105,43 @@ def test_wait_for_debug_endpoint_retries(monkeypatch):
         def __exit__(self, exc_type, exc, tb):
             return False
 
+    def fake_connect(address, timeout=None):
+        state["connects"] += 1
+        if state["connects"] < 3:
+            raise ConnectionRefusedError("not listening")
+        return DummyResp()
+
     def fake_open(url, timeout=1):
         state["count"] += 1
-        if state["count"] < 3:
+        if state["count"] < 2:
             raise ConnectionError("not ready")
         return DummyResp()
 
+    monkeypatch.setattr("cookie_monster.chrome_launcher.socket.create_connection", fake_connect)
     monkeypatch.setattr("cookie_monster.chrome_launcher.urllib.request.urlopen", fake_open)
     monkeypatch.setattr("cookie_monster.chrome_launcher.time.sleep", lambda *_: None)
 
     chrome_launcher.wait_for_debug_endpoint("127.0.0.1", 9222, timeout_seconds=2)
-    assert state["count"] == 3
+    # HTTP is only tried once the port accepts connections.
+    assert state == {"count": 2, "connects": 4}
 
 
 def test_detect_edge_path_on_macos(monkeypatch):
+    monkeypatch.setattr("cookie_monster.chrome_launcher._detected_paths", {})
     monkeypatch.setattr("cookie_monster.chrome_launcher.platform.system", lambda: "Darwin")
     monkeypatch.setattr(
-        "cookie_monster.chrome_launcher.os.path.exists",
-        lambda p: p == "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge",
+        "cookie_monster.chrome_launcher.os.access",
+        lambda p, mode: p == "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge",
     )
+    assert chrome_launcher.detect_browser_path("chrome") is None
     path = chrome_launcher.detect_browser_path("edge")
     assert path == "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge"
 
+    # A found path is remembered; misses are not.
+    monkeypatch.setattr("cookie_monster.chrome_launcher.os.access", lambda p, mode: True)
+    assert chrome_launcher.detect_browser_path("edge") == path
+    assert chrome_launcher.detect_browser_path("chrome") == "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+
 
 # ── browser_is_reachable ─────────────────────────────────────────────────────
 
@@ -180,3 +196,47 @@ def test_is_browser_process_running_not_found(monkeypatch):
         lambda *a, **kw: FakeResult(),
     )
     assert chrome_launcher.is_browser_process_running("chrome") is False
+
+
+def test_is_browser_process_running_scans_proc_on_linux(monkeypatch, tmp_path):
+    for pid, cmdline in {"12": b"/opt/Microsoft/MSEdge\0--type=renderer\0", "self": b"x"}.items():
+        (tmp_path / pid).mkdir()
+        (tmp_path / pid / "cmdline").write_bytes(cmdline)
+    (tmp_path / "13").mkdir()  # exited between listdir and open
+
+    monkeypatch.setattr("cookie_monster.chrome_launcher.platform.system", lambda: "Linux")
+    monkeypatch.setattr("cookie_monster.chrome_launcher._PROC_ROOT", str(tmp_path))
+    monkeypatch.setattr(
+        "cookie_monster.chrome_launcher.subprocess.run",
+        lambda *a, **kw: (_ for _ in ()).throw(AssertionError("pgrep should not run")),
+    )
+    assert chrome_launcher.is_browser_process_running("edge") is True
+    assert chrome_launcher.is_browser_process_running("chrome") is False
+
+
+def test_browser_session_close_kills_browser_that_ignores_terminate():
+    import subprocess
+
+    from cookie_monster.browser_session import BrowserLaunchConfig, BrowserSession
+
+    calls = []
+
+    class StubbornProc:
+        def terminate(self):
+            calls.append("terminate")
+
+        def wait(self, timeout=None):
+            calls.append(("wait", timeout))
+            if timeout is not None:
+                raise subprocess.TimeoutExpired("chrome", timeout)
+            return -9
+
+        def kill(self):
+            calls.append("kill")
+
+    session = BrowserSession(BrowserLaunchConfig())
+    session._proc = StubbornProc()
+    session.close()
+    session.close()
+
+    assert calls == ["terminate", ("wait", BrowserSession.TERMINATE_TIMEOUT_SECONDS), "kill", ("wait", None)]
@@ -9,7 +9,7 @@ def test_profile_list_command(monkeypatch, capsys):
         ["cookie-monster", "profile-list", "--browser", "chrome", "--user-data-dir", "/tmp/chrome"],
     )
     monkeypatch.setattr(
-        "cookie_monster.cli.list_profiles",
+        "cookie_monster.browser_profiles.list_profiles",
         lambda user_data_dir: [{"profile_directory": "Default", "name": "Brian", "email": "x@y.com"}],
     )
     cli.main()
@@ -21,7 +21,7 @@ def test_profile_list_command(monkeypatch, capsys):
 def test_list_targets_command(monkeypatch, capsys):
     monkeypatch.setattr("sys.argv", ["cookie-monster", "list-targets"])
     monkeypatch.setattr(
-        "cookie_monster.cli.list_page_targets",
+        "cookie_monster.chrome_discovery.list_page_targets",
         lambda host, port: [{"id": "1", "title": "Tab", "url": "https://a", "type": "page"}],
     )
     cli.main()
@@ -33,7 +33,7 @@ def test_list_targets_command(monkeypatch, capsys):
 def test_doctor_command(monkeypatch, capsys):
     monkeypatch.setattr("sys.argv", ["cookie-monster", "doctor", "--browser", "chrome"])
     monkeypatch.setattr(
-        "cookie_monster.cli.run_doctor",
+        "cookie_monster.doctor.run_doctor",
         lambda browser, host, port, user_data_dir: {"browser": browser, "ok": True},
     )
     cli.main()
@@ -52,7 +52,7 @@ def test_adapter_list_command(monkeypatch, capsys):
 
 def test_recipe_list_command(monkeypatch, capsys):
     monkeypatch.setattr("sys.argv", ["cookie-monster", "recipe-list"])
-    monkeypatch.setattr("cookie_monster.cli.list_recipes", lambda base_dir=None: ["r1", "r2"])
+    monkeypatch.setattr("cookie_monster.recipes.list_recipes", lambda base_dir=None: ["r1", "r2"])
     cli.main()
     out = capsys.readouterr().out
     data = json.loads(out)
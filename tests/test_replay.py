@@ -1,10 +1,17 @@
 import json
 
 import pytest
+import requests
 
 from cookie_monster.config import ReplayConfig
 from cookie_monster.models import CapturedRequest
-from cookie_monster.replay import _pick_capture, _sanitize_headers, replay_with_capture
+from cookie_monster.replay import (
+    _pick_capture,
+    _sanitize_headers,
+    body_preview,
+    new_replay_session,
+    replay_with_capture,
+)
 
 
 class DummyResponse:
@@ -152,3 +159,64 @@ def test_replay_uses_captured_body_when_enabled(tmp_path, monkeypatch):
     assert response.status_code == 200
     assert called["data"] == "{\"name\":\"demo\"}"
     assert called["json"] is None
+
+
+def test_replay_uses_injected_session(tmp_path):
+    capture_file = tmp_path / "captures.jsonl"
+    capture_file.write_text(
+        json.dumps({"request_id": "1", "method": "GET", "url": "https://github.com/api", "headers": {"Cookie": "x=1"}})
+        + "\n",
+        encoding="utf-8",
+    )
+
+    class FakeSession:
+        def __init__(self):
+            self.calls = []
+
+        def request(self, method, url, headers, timeout, data=None, json=None):
+            self.calls.append((method, url, headers))
+            return DummyResponse(status_code=200, text="ok")
+
+    session = FakeSession()
+    cfg = ReplayConfig(capture_file=str(capture_file), request_url="https://github.com/settings", method="GET")
+    response = replay_with_capture(cfg, session=session)
+    assert response.status_code == 200
+    assert session.calls == [("GET", "https://github.com/settings", {"Cookie": "x=1"})]
+
+
+def test_new_replay_session_does_not_store_response_cookies():
+    from email.message import Message
+
+    import requests
+    from requests.cookies import MockRequest, MockResponse
+
+    headers = Message()
+    headers["Set-Cookie"] = "sid=abc; Path=/"
+    request = requests.Request("GET", "https://github.com/").prepare()
+
+    session = new_replay_session()
+    session.cookies.extract_cookies(MockResponse(headers), MockRequest(request))
+    assert len(session.cookies) == 0
+
+    plain = requests.Session()
+    plain.cookies.extract_cookies(MockResponse(headers), MockRequest(request))
+    assert len(plain.cookies) == 1
+
+
+def _response(content: bytes, encoding: str | None) -> requests.Response:
+    response = requests.Response()
+    response._content = content  # noqa: SLF001
+    response.encoding = encoding
+    return response
+
+
+def test_body_preview_matches_text_prefix_for_multibyte_bodies():
+    response = _response(("é€😀" * 500).encode("utf-8"), "utf-8")
+    assert body_preview(response) == response.text[:400]
+    assert body_preview(response, limit=5) == "é€😀é€"
+
+
+def test_body_preview_skips_charset_detection_and_bad_charsets(monkeypatch):
+    monkeypatch.setattr(requests.Response, "apparent_encoding", property(lambda self: pytest.fail("detected")))
+    assert body_preview(_response(b'{"ok":true}', None)) == '{"ok":true}'
+    assert body_preview(_response(b"ok", "not-a-charset")) == "ok"
@@ -20,3 +20,28 @@ def test_storage_roundtrip(tmp_path):
     assert len(loaded) == 1
     assert loaded[0].request_id == "1"
     assert loaded[0].headers["Cookie"] == "a=b"
+
+
+def test_captured_request_auth_header_flags_are_case_insensitive():
+    cap = CapturedRequest("1", "GET", "https://example.com", {"AUTHORIZATION": "Bearer t", "Accept": "*/*"})
+    assert cap.header_names == frozenset({"authorization", "accept"})
+    assert cap.lower_headers == {"authorization": "Bearer t", "accept": "*/*"}
+    assert cap.host == "example.com"
+    assert cap.has_authorization_header is True
+    assert cap.has_cookie_header is False
+    assert cap == CapturedRequest("1", "GET", "https://example.com", dict(cap.headers), seen_at=cap.seen_at)
+
+
+def test_iter_captures_streams_and_skips_blank_lines(tmp_path):
+    from cookie_monster.storage import iter_captures
+
+    out = tmp_path / "captures.jsonl"
+    append_captures(str(out), [CapturedRequest("1", "GET", "https://example.com/ü", {"Cookie": "a=b"})])
+    with out.open("a", encoding="utf-8") as f:
+        f.write("\r\n\n")
+    append_captures(str(out), [CapturedRequest("2", "POST", "https://example.com", {"Cookie": "c=d"})])
+
+    it = iter_captures(str(out))
+    first = next(it)
+    assert first.url == "https://example.com/ü"
+    assert [c.request_id for c in it] == ["2"]
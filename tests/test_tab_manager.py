@@ -40,6 +40,12 @@ class FakeCDPClient:
             return {"targetInfos": []}
         return {}
 
+    def clear_events(self):
+        self._events.clear()
+
+    def send_commands(self, commands):
+        return [self.send_command(method, params) for method, params in commands]
+
     def enable_page_events(self):
         self.send_command("Page.enable", {})
 
@@ -290,3 +296,35 @@ def test_close_tab_cli_command(monkeypatch, capsys):
     data = json.loads(out)
     assert data["closed"] is True
     assert data["target_id"] == "BBB"
+
+
+def test_first_page_command_is_pipelined_with_page_enable(monkeypatch):
+    fake_client = FakeCDPClient("ws://fake")
+    batches = []
+    original = fake_client.send_commands
+    fake_client.send_commands = lambda commands: batches.append(list(commands)) or original(batches[-1])
+    monkeypatch.setattr("cookie_monster.tab_manager.CDPClient", lambda ws_url: fake_client)
+    mgr = TabManager(TabManagerConfig())
+
+    mgr.navigate("AAA", "https://example.com")
+    mgr.refresh("AAA", ignore_cache=True)
+
+    assert batches == [[("Page.enable", {}), ("Page.navigate", {"url": "https://example.com"})]]
+    assert fake_client.commands[-1] == ("Page.reload", {"ignoreCache": True})
+    mgr.close()
+
+
+def test_reused_client_drops_stale_load_event_before_next_command(monkeypatch):
+    fake_client = FakeCDPClient("ws://fake")
+    # Report a load only if a Page.loadEventFired is still held back.
+    fake_client.wait_for_load = lambda timeout_seconds=30.0: any(
+        e and e.get("method") == "Page.loadEventFired" for e in fake_client._events
+    )
+    monkeypatch.setattr("cookie_monster.tab_manager.CDPClient", lambda ws_url: fake_client)
+    mgr = TabManager(TabManagerConfig())
+
+    mgr.navigate("AAA", "https://example.com")
+    fake_client._events.append({"method": "Page.loadEventFired", "params": {}})
+    assert mgr.refresh("AAA") is False
+    assert fake_client.commands[-1][0] == "Page.reload"
+    mgr.close()